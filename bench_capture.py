@@ -0,0 +1,89 @@
+import argparse
+import multiprocessing
+import resource
+import sys
+import time
+
+from PIL import Image
+
+from frame_source import QuartzFrameSource, cgimage_to_pil
+
+
+def legacy_cgimage_to_pil(cg_image, screen_width, screen_height):
+    # 原 capture_fullscreen 的转换路径：CGImage -> NSImage -> TIFF -> NSBitmapImageRep -> PIL
+    from AppKit import NSImage, NSBitmapImageRep
+
+    ns_image = NSImage.alloc().initWithCGImage_size_(cg_image, (screen_width, screen_height))
+    bitmap_rep = NSBitmapImageRep.imageRepWithData_(ns_image.TIFFRepresentation())
+    width = bitmap_rep.pixelsWide()
+    height = bitmap_rep.pixelsHigh()
+    raw_data = bitmap_rep.bitmapData()
+    return Image.frombuffer("RGBA", (width, height), raw_data, "raw", "RGBA", 0, 1)
+
+
+def peak_rss_bytes():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位是 KB，macOS 是字节
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _convert_fn(name):
+    if name == "legacy":
+        from AppKit import NSScreen
+
+        frame = NSScreen.mainScreen().frame()
+        screen_width, screen_height = int(frame.size.width), int(frame.size.height)
+        return lambda cg: legacy_cgimage_to_pil(cg, screen_width, screen_height)
+    return cgimage_to_pil
+
+
+def _measure_worker(name, repeats, out):
+    # 在独立进程里跑：峰值 RSS 不受前一种方式影响。像素缓冲、NSImage / TIFF / CFData 都是原生内存，
+    # tracemalloc 看不到，这里用进程峰值 RSS 增量和 Pillow 自己的内存块统计
+    source = QuartzFrameSource()
+    convert = _convert_fn(name)
+    convert(source.grab_cgimage())  # 预热：加载框架、建立截图通道
+    base_rss = peak_rss_bytes()
+    base_stats = Image.core.get_stats()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        img = convert(source.grab_cgimage())
+        img.load()
+        times.append(time.perf_counter() - start)
+        del img
+    stats = Image.core.get_stats()
+    out.put({
+        'times': times,
+        'rss_growth': peak_rss_bytes() - base_rss,
+        'pil_images': stats['new_count'] - base_stats['new_count'],
+        'pil_blocks': stats['allocated_blocks'] - base_stats['allocated_blocks'],
+    })
+
+
+def measure(label, name, repeats):
+    # 截图本身也计入耗时
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    worker = ctx.Process(target=_measure_worker, args=(name, repeats, out))
+    worker.start()
+    result = out.get()
+    worker.join()
+
+    times = sorted(result['times'])
+    print(f"{label:<14} mean {sum(times) / len(times) * 1000:7.1f} ms  p50 {times[len(times) // 2] * 1000:7.1f} ms"
+          f"  峰值 RSS 增长 {result['rss_growth'] / 1e6:7.1f} MB"
+          f"  Pillow 新建图像 {result['pil_images']}  分配块 {result['pil_blocks']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比 TIFF 中转与直接读取像素缓冲的截图耗时 / 原生内存（仅 macOS）")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    measure("TIFF 中转", "legacy", args.repeats)
+    measure("原始缓冲->PIL", "direct", args.repeats)
+
+
+if __name__ == "__main__":
+    main()
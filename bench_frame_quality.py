@@ -0,0 +1,51 @@
+import argparse
+import time
+
+from frame_quality import FrameSelector
+from frame_source import open_frame_source
+from ocr_translate_core import ocr_words
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线回放视频 / 图片目录，统计帧筛选省掉的 OCR 次数")
+    parser.add_argument("path", help="视频文件或图片目录")
+    parser.add_argument("--source", choices=["video", "dir"], default="video")
+    parser.add_argument("--stable", type=int, default=3, help="连续多少帧不动才 OCR")
+    parser.add_argument("--motion", type=float, default=3.0, help="运动阈值（缩小灰度图平均差）")
+    parser.add_argument("--min-sharpness", type=float, default=20.0)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--ocr", action="store_true", help="对选中的帧实际跑 OCR 并计时")
+    args = parser.parse_args()
+
+    selector = FrameSelector(stable_frames=args.stable, motion_threshold=args.motion,
+                             min_sharpness=args.min_sharpness)
+    source = open_frame_source(args.source, args.path)
+    total = selected = 0
+    select_time = ocr_time = 0.0
+    with source:
+        for frame in source.frames(limit=args.limit):
+            total += 1
+            start = time.perf_counter()
+            best = selector.push(frame)
+            select_time += time.perf_counter() - start
+            if best is None:
+                continue
+            selected += 1
+            line = f"第 {total} 帧：运动 {selector.last_motion:.2f}，清晰度 {selector.last_sharpness:.1f}"
+            if args.ocr:
+                start = time.perf_counter()
+                words = ocr_words(best)
+                elapsed = time.perf_counter() - start
+                ocr_time += elapsed
+                line += f"，OCR {elapsed * 1000:.0f} ms / {len(words)} 词"
+            print(line)
+
+    if total:
+        print(f"共 {total} 帧，OCR {selected} 帧（省掉 {1 - selected / total:.1%}），"
+              f"筛选平均 {select_time / total * 1000:.2f} ms/帧")
+        if args.ocr and selected:
+            print(f"OCR 合计 {ocr_time:.2f}s，逐帧 OCR 估计 {ocr_time / selected * total:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import argparse
+import random
+
+import numpy as np
+from PIL import Image
+
+import incremental_ocr
+from frame_diff import FrameChangeDetector
+from incremental_ocr import IncrementalOcr
+
+
+class FixedDirtyDetector(FrameChangeDetector):
+    """按给定的 dirty 网格序列返回结果，不看画面内容。"""
+
+    def __init__(self, grids, tile_size=128):
+        super().__init__(tile_size=tile_size)
+        self.grids = list(grids)
+
+    def update(self, img):
+        self.image_size = img.size
+        return self.grids.pop(0)
+
+
+def make_word(text, left, top, width, height):
+    return {'text': text, 'left': left, 'top': top, 'width': width, 'height': height,
+            'right': left + width, 'bottom': top + height}
+
+
+class FakeScreen:
+    """
+    替代 Tesseract：屏幕上的单词放在原图坐标里，ocr_words 返回完整落在裁剪框内的单词，
+    坐标带几个像素的随机抖动，模拟裁剪识别与整帧识别的框不完全一致。
+    """
+
+    def __init__(self, words, jitter=0, seed=0):
+        self.words = words
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    def ocr_words(self, img, offset_x=0, offset_y=0, scale=None):
+        self.calls += 1
+        right, bottom = offset_x + img.size[0], offset_y + img.size[1]
+        found = []
+        for w in self.words:
+            if w['left'] >= offset_x and w['top'] >= offset_y and w['right'] <= right and w['bottom'] <= bottom:
+                dx = self.rng.randint(-self.jitter, self.jitter)
+                dy = self.rng.randint(-self.jitter, self.jitter)
+                found.append(make_word(w['text'], w['left'] + dx, w['top'] + dy, w['width'], w['height']))
+        return found
+
+    def ocr_frame_words(self, img):
+        return self.ocr_words(img)
+
+
+def run(words, grids, jitter=0, seed=0, size=(512, 384)):
+    screen = FakeScreen(words, jitter, seed)
+    incremental_ocr.ocr_words = screen.ocr_words
+    incremental_ocr.ocr_frame_words = screen.ocr_frame_words
+    tracker = IncrementalOcr(detector=FixedDirtyDetector(grids))
+    img = Image.new("RGB", size)
+    result = None
+    for _ in grids:
+        result, _ = tracker.update(img)
+    return sorted(w['text'] for w in result)
+
+
+def check_cross_tile_word():
+    # 单词跨过 y=128，位于 col 0；dirty 为第 0 行 col 0-2、第 1 行 col 0-1，拆成两个矩形
+    words = [make_word("hello", 20, 110, 60, 30), make_word("world", 300, 300, 60, 20)]
+    full = np.ones((3, 4), dtype=bool)
+    dirty = np.zeros((3, 4), dtype=bool)
+    dirty[0, 0:3] = True
+    dirty[1, 0:2] = True
+    got = run(words, [full, dirty])
+    assert got == ["hello", "world"], got
+
+
+def random_words(rng, count, size=(512, 384)):
+    # 互不重叠的随机单词（真实屏幕上的单词框不会叠在一起）；
+    # 半宽不超过 padding - 抖动，保证单词总能完整落在中心所在矩形的裁剪里（更长的单词会被裁断，是 padding 的固有限制）
+    words = []
+    while len(words) < count:
+        width, height = rng.randint(20, 56), rng.randint(12, 30)
+        w = make_word(f"w{len(words)}", rng.randint(0, size[0] - width), rng.randint(0, size[1] - height), width, height)
+        if not any(w['left'] < o['right'] and o['left'] < w['right'] and w['top'] < o['bottom'] and o['top'] < w['bottom']
+                   for o in words):
+            words.append(w)
+    return words
+
+
+def check_jitter(cases, seed):
+    # 随机单词 + 随机 dirty 网格，裁剪识别的框带 ±3 px 抖动；每个单词必须恰好出现一次
+    rng = random.Random(seed)
+    for case in range(cases):
+        words = random_words(rng, 40)
+        grids = [np.ones((3, 4), dtype=bool)]
+        for _ in range(5):
+            grids.append(np.array([[rng.random() < 0.3 for _ in range(4)] for _ in range(3)]))
+        got = run(words, grids, jitter=3, seed=case)
+        assert got == sorted(w['text'] for w in words), f"第 {case} 组单词重复或丢失：{got}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="无 Tesseract 校验增量 OCR 合并结果不重复（ocr_words 用假实现替代）")
+    parser.add_argument("--cases", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    check_cross_tile_word()
+    print("跨 tile 单词：只保留一份")
+    check_jitter(args.cases, args.seed)
+    print(f"随机 {args.cases} 组（坐标抖动 ±3 px）：每个单词恰好一份")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import argparse
+import json
+import os
+import random
+import time
+
+import numpy as np
+
+from layout_grouping import group_words_into_blocks
+
+
+def legacy_group_words_into_blocks(words, scale_x=0.5, scale_y=0.5):
+    # 原 get_text_blocks 里基于 DBSCAN 的实现，原样保留作为对照
+    from sklearn.cluster import DBSCAN
+
+    if not words:
+        return []
+
+    # Step 1: Y方向聚类（文本行）
+    avg_height = np.mean([w['height'] for w in words]) or 1.0
+    y_points = np.array([
+        [0, (w['top'] + w['height'] / 2) / avg_height]
+        for w in words
+    ])
+    line_clustering = DBSCAN(eps=1.0, min_samples=1).fit(y_points)
+    line_labels = line_clustering.labels_
+
+    from collections import defaultdict
+    lines_dict = defaultdict(list)
+    for word, label in zip(words, line_labels):
+        lines_dict[label].append(word)
+
+    # Step 2: 行内按 X 方向聚合段落
+    paragraphs = []
+    for line in lines_dict.values():
+        line.sort(key=lambda w: w['left'])
+        current_para = [line[0]]
+        for i in range(1, len(line)):
+            prev = current_para[-1]
+            curr = line[i]
+            gap = curr['left'] - prev['right']
+            avg_width = np.mean([w['width'] for w in line]) or 1.0
+            if gap > avg_width * 1.5:
+                paragraphs.append(current_para)
+                current_para = [curr]
+            else:
+                current_para.append(curr)
+        if current_para:
+            paragraphs.append(current_para)
+
+    results = []
+    for group in paragraphs:
+        if not group:
+            continue
+
+        # 把这段的坐标和内容一起保存（先不排序）
+        full_text = " ".join([w['text'] for w in group])
+        # 使用第一个词作为 anchor 显示点
+        anchor = group[0]
+        left = anchor['left']
+        top = anchor['top']
+        right = max(w['right'] for w in group)
+        bottom = max(w['bottom'] for w in group)
+
+        results.append({
+            'text': full_text,
+            'left': left * scale_x,
+            'top': top * scale_y,
+            'width': (right - left) * scale_x,
+            'height': (bottom - top) * scale_y,
+            'original_top': top
+        })
+
+    # ✅ 按原始 top 排序（再也不会丢失映射）
+    results.sort(key=lambda b: b['original_top'])
+
+    # ✅ 最后删除辅助字段
+    for b in results:
+        del b['original_top']
+
+    return results
+
+
+def synthetic_words(seed, n_lines, words_per_line):
+    # 模拟屏幕文字：若干行、行高和字宽有抖动，行内随机出现大间距（分栏）
+    rng = random.Random(seed)
+    words = []
+    y = rng.randint(0, 40)
+    for _ in range(n_lines):
+        height = rng.randint(14, 40)
+        x = rng.randint(0, 200)
+        for _ in range(rng.randint(1, words_per_line)):
+            width = rng.randint(10, 160)
+            top = y + rng.randint(-4, 4)
+            h = max(1, height + rng.randint(-3, 3))
+            words.append({
+                'text': f"w{len(words)}",
+                'left': x,
+                'top': top,
+                'width': width,
+                'height': h,
+                'right': x + width,
+                'bottom': top + h
+            })
+            x += width + (rng.randint(200, 600) if rng.random() < 0.15 else rng.randint(4, 20))
+        y += height + rng.randint(0, 30)
+    # OCR 输出并不严格按行排列，打乱一部分顺序
+    rng.shuffle(words)
+    return words
+
+
+def load_word_sets(paths):
+    # 录制的单词 JSON：[[word, ...], ...] 或 [word, ...]
+    sets = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data and isinstance(data[0], dict):
+            data = [data]
+        sets.extend(data)
+    return sets
+
+
+# DBSCAN 实现生成的固定输入 / 输出，没有安装 scikit-learn 也能校验新实现
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "layout_grouping.json")
+GOLDEN_SCALES = [(0.5, 0.5), (1.0, 1.0), (0.75, 0.6)]
+
+
+def golden_cases(count):
+    cases = []
+    for i in range(count):
+        seed = i * 7
+        words = synthetic_words(seed, n_lines=1 + seed % 60, words_per_line=1 + seed % 25)
+        scale_x, scale_y = GOLDEN_SCALES[i % len(GOLDEN_SCALES)]
+        cases.append({'words': words, 'scale_x': scale_x, 'scale_y': scale_y})
+    return cases
+
+
+def write_golden(path, count):
+    cases = golden_cases(count)
+    for case in cases:
+        case['expected'] = legacy_group_words_into_blocks(case['words'], case['scale_x'], case['scale_y'])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(cases, f, separators=(",", ":"))
+    print(f"写入 {len(cases)} 组基准结果到 {path}")
+
+
+def check_golden(path):
+    with open(path, encoding="utf-8") as f:
+        cases = json.load(f)
+    mismatches = 0
+    for i, case in enumerate(cases):
+        actual = group_words_into_blocks(case['words'], case['scale_x'], case['scale_y'])
+        if actual != case['expected']:
+            mismatches += 1
+            print(f"[golden {i}] 结果不一致：{len(case['words'])} 个单词")
+    print(f"基准结果 {len(cases)} 组，不一致 {mismatches} 组")
+    return mismatches
+
+
+def timed(fn, words, repeats):
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(words)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对照原 DBSCAN 实现校验行/段落分组结果一致并比较耗时")
+    parser.add_argument("word_files", nargs="*", help="录制的单词 JSON 文件")
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--golden", default=GOLDEN_PATH, help="DBSCAN 生成的基准输入 / 输出 JSON")
+    parser.add_argument("--write-golden", type=int, metavar="N", default=None,
+                        help="用 DBSCAN 实现重新生成 N 组基准结果（需要 scikit-learn）")
+    args = parser.parse_args()
+
+    if args.write_golden:
+        write_golden(args.golden, args.write_golden)
+        return
+
+    mismatches = check_golden(args.golden)
+    try:
+        import sklearn  # noqa: F401
+    except ImportError:
+        # scikit-learn 已不是运行依赖，没有安装时只对照基准文件
+        print("未安装 scikit-learn，跳过与 DBSCAN 的实时对照和耗时比较")
+        if mismatches:
+            raise SystemExit(1)
+        return
+
+    word_sets = load_word_sets(args.word_files)
+    for seed in range(args.cases):
+        word_sets.append(synthetic_words(seed, n_lines=1 + seed % 60, words_per_line=1 + seed % 25))
+
+    legacy_total = new_total = 0.0
+    for i, words in enumerate(word_sets):
+        legacy_time, expected = timed(legacy_group_words_into_blocks, words, args.repeats)
+        new_time, actual = timed(group_words_into_blocks, words, args.repeats)
+        legacy_total += legacy_time
+        new_total += new_time
+        if actual != expected:
+            mismatches += 1
+            print(f"[{i}] 结果不一致：{len(words)} 个单词")
+
+    print(f"{len(word_sets)} 组，不一致 {mismatches} 组")
+    print(f"DBSCAN 合计 {legacy_total * 1000:.1f} ms，新实现合计 {new_total * 1000:.1f} ms，"
+          f"x{legacy_total / max(new_total, 1e-9):.1f}")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import time
+
+from PIL import Image
+
+from ocr_translate_core import ocr_words
+from parallel_ocr import ParallelOcr
+
+
+def timed(fn, img, repeats):
+    times = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(img)
+        times.append(time.perf_counter() - start)
+    return min(times), sum(times) / len(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比整帧单进程 OCR 与并行条带 OCR 的耗时")
+    parser.add_argument("images", nargs="*", default=["debug_frame.png"])
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--overlap", type=int, default=64)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    for path in args.images:
+        img = Image.open(path)
+        img.load()
+        print(f"== {path} {img.size[0]}x{img.size[1]}")
+
+        best, mean, words = timed(ocr_words, img, args.repeats)
+        baseline_texts = sorted(w['text'] for w in words)
+        print(f"单进程    best {best:.3f}s  mean {mean:.3f}s  words {len(words)}")
+
+        for workers in args.workers:
+            pool = ParallelOcr(workers=workers, overlap=args.overlap)
+            # 先跑一次让进程池启动、语言数据进缓存
+            pool.ocr_words(img)
+            p_best, p_mean, p_words = timed(pool.ocr_words, img, args.repeats)
+            pool.close()
+            same = sorted(w['text'] for w in p_words) == baseline_texts
+            print(f"{workers} 进程    best {p_best:.3f}s  mean {p_mean:.3f}s  words {len(p_words)}"
+                  f"  speedup x{best / p_best:.2f}  与单进程结果一致: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+import ocr_translate_core
+from fake_translate_server import FakeTranslateServer
+from frame_source import ImageDirFrameSource
+from metrics import metrics
+from ocr_translate_core import get_text_blocks, translate_batch
+
+STAGES = ("ocr", "grouping", "translate", "frame")
+
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位是 KB，macOS 是字节
+    return rss / 1e6 if sys.platform == "darwin" else rss / 1e3
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def load_corpus(paths):
+    frames = []
+    for path in paths:
+        source = ImageDirFrameSource(path)
+        frames.extend((source_path, frame) for source_path, frame in zip(source.paths, source.frames()))
+    return frames
+
+
+def run(frames, passes, cold_cache):
+    metrics.reset()
+    start = time.perf_counter()
+    count = 0
+    for _ in range(passes):
+        for _, frame in frames:
+            if cold_cache:
+                ocr_translate_core.translation_cache.clear()
+                ocr_translate_core.translation_memory.clear()
+            with metrics.timer("frame"):
+                blocks = get_text_blocks(frame)
+                translate_batch([b['text'] for b in blocks])
+            metrics.inc("blocks", len(blocks))
+            count += 1
+    elapsed = time.perf_counter() - start
+
+    snap = metrics.snapshot()
+    stages = {}
+    for stage in STAGES:
+        hist = snap['histograms'].get(stage + "_seconds")
+        if hist:
+            stages[stage] = {k: hist[k] for k in ("count", "mean", "p50", "p95", "p99", "max")}
+    return {
+        'frames': count,
+        'seconds': elapsed,
+        'fps': count / elapsed if elapsed else 0.0,
+        'blocks_per_frame': snap['counters'].get("blocks", 0) / count if count else 0.0,
+        'translation_errors': snap['counters'].get("translation_errors", 0),
+        'dedup_ratio': 1 - snap['counters'].get("translate_texts_unique", 0) / max(snap['counters'].get("translate_texts", 0), 1),
+        'stages': stages,
+    }
+
+
+def compare(result, baseline_path, tolerance):
+    # 与之前的 JSON 结果对比 p95，超过容忍度视为回退
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = []
+    for stage, stats in result['stages'].items():
+        old = baseline.get('stages', {}).get(stage)
+        if not old or not old['p95']:
+            continue
+        change = stats['p95'] / old['p95'] - 1.0
+        print(f"  {stage:<10} p95 {old['p95'] * 1000:8.1f} -> {stats['p95'] * 1000:8.1f} ms ({change:+.0%})")
+        if change > tolerance:
+            regressions.append(stage)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="端到端基准：回放截图语料，OCR + 翻译（本地假翻译服务）")
+    parser.add_argument("corpus", nargs="*", default=["debug_frame.png"], help="截图文件或目录")
+    parser.add_argument("--passes", type=int, default=3, help="语料回放轮数")
+    parser.add_argument("--latency", type=float, default=0.05, help="假翻译服务每请求延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.02, help="假翻译服务延迟抖动（秒）")
+    parser.add_argument("--per-text", type=float, default=0.002, help="假翻译服务每条文本额外延迟（秒）")
+    parser.add_argument("--cold-cache", action="store_true", help="每帧前清空翻译缓存")
+    parser.add_argument("--json", dest="json_path", help="结果写入 JSON 文件")
+    parser.add_argument("--baseline", help="与之前的 JSON 结果对比 p95")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="p95 变慢超过该比例即判为回退")
+    args = parser.parse_args()
+
+    server = FakeTranslateServer(latency=args.latency, jitter=args.jitter, per_text=args.per_text, seed=0).start()
+    ocr_translate_core.TRANSLATE_URL = server.url
+    ocr_translate_core.set_translation_engine(None)
+    ocr_translate_core.translation_cache.clear()
+
+    frames = load_corpus(args.corpus)
+    try:
+        result = run(frames, args.passes, args.cold_cache)
+    finally:
+        server.stop()
+
+    result.update({
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': [path for path, _ in frames],
+        'config': {
+            'passes': args.passes,
+            'latency': args.latency,
+            'jitter': args.jitter,
+            'per_text': args.per_text,
+            'cold_cache': args.cold_cache,
+            'ocr_engine': ocr_translate_core.get_ocr_engine().name,
+            'ocr_workers': ocr_translate_core.OCR_WORKERS,
+            'translate_engine': ocr_translate_core.TRANSLATE_ENGINE,
+        },
+        'translate_requests': server.requests,
+        'peak_rss_mb': peak_rss_mb(),
+    })
+
+    print(f"{result['frames']} 帧，{result['seconds']:.2f}s，{result['fps']:.2f} fps，"
+          f"平均 {result['blocks_per_frame']:.1f} 块/帧，批内去重 {result['dedup_ratio']:.1%}，翻译请求 {server.requests} 次，峰值 RSS {result['peak_rss_mb']:.0f} MB")
+    for stage, stats in result['stages'].items():
+        print(f"  {stage:<10} p50 {stats['p50'] * 1000:8.1f} ms  p95 {stats['p95'] * 1000:8.1f} ms  "
+              f"p99 {stats['p99'] * 1000:8.1f} ms")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        regressions = compare(result, args.baseline, args.tolerance)
+        if regressions:
+            print("性能回退：", ", ".join(regressions))
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
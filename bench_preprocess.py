@@ -0,0 +1,71 @@
+import argparse
+import time
+from collections import Counter
+
+import ocr_translate_core
+from frame_source import ImageDirFrameSource
+from ocr_translate_core import ocr_words
+from preprocess import OcrPreprocessor
+
+# (名称, 前处理参数)；None 表示不做前处理（原始整帧 OCR，作为基准）
+CONFIGS = [
+    ("原图", None),
+    ("灰度", dict(target_text_height=None)),
+    ("灰度+缩放32", dict(target_text_height=32)),
+    ("灰度+缩放24", dict(target_text_height=24)),
+    ("灰度+缩放20", dict(target_text_height=20, min_scale=0.3)),
+    ("缩放24+对比度", dict(target_text_height=24, normalize_contrast=True)),
+    ("缩放24+二值化", dict(target_text_height=24, binarize=True)),
+]
+
+
+def run_config(frames, options, repeats):
+    ocr_translate_core.OCR_PREPROCESS = options is not None
+    if options is not None:
+        ocr_translate_core._preprocessor = OcrPreprocessor(**options)
+    best = 0.0
+    results = []
+    for frame in frames:
+        if options is not None:
+            # 先跑一次整帧识别得到文字高度，模拟稳定运行时的自适应缩放
+            ocr_translate_core.get_preprocessor().observe_words(ocr_words(frame, scale=1.0))
+        frame_best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            words = ocr_words(frame)
+            frame_best = min(frame_best, time.perf_counter() - start)
+        best += frame_best
+        scale = ocr_translate_core.get_preprocessor().current_scale() if options is not None else 1.0
+        results.append((words, scale))
+    return best, results
+
+
+def recall(reference, words):
+    # 按单词文本多重集合计算召回率
+    ref = Counter(w['text'] for w in reference)
+    got = Counter(w['text'] for w in words)
+    total = sum(ref.values())
+    return sum((ref & got).values()) / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较不同 OCR 前处理配置的耗时与单词召回率")
+    parser.add_argument("corpus", nargs="*", default=["debug_frame.png"])
+    parser.add_argument("--repeats", type=int, default=2)
+    args = parser.parse_args()
+
+    frames = []
+    for path in args.corpus:
+        frames.extend(ImageDirFrameSource(path).frames())
+
+    baseline_time, baseline = run_config(frames, None, args.repeats)
+    for name, options in CONFIGS:
+        elapsed, results = run_config(frames, options, args.repeats)
+        rates = [recall(ref, words) for (ref, _), (words, _) in zip(baseline, results)]
+        scales = ", ".join(f"{scale:.2f}" for _, scale in results)
+        print(f"{name:<12} OCR {elapsed * 1000:8.0f} ms  x{baseline_time / elapsed:5.2f}"
+              f"  召回 {sum(rates) / len(rates):6.1%}  缩放 [{scales}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import random
+import time
+
+from render_diff import ADD, MOVE, REMOVE, UPDATE, FakeRenderer, RenderDiffer, make_overlay
+
+
+def check_sequence():
+    # 固定的几帧：新增 -> 移动 / 改字 / 新增 -> 移除后再新增，核对操作和窗口复用
+    renderer = FakeRenderer()
+    differ = RenderDiffer(renderer)
+
+    def overlay(key, x, text):
+        return make_overlay(key, x, 0, 100, 20, text, 14)
+
+    steps = [
+        ([overlay(1, 0, "a"), overlay(2, 0, "b")], [(ADD, 1), (ADD, 2)]),
+        ([overlay(1, 5, "a"), overlay(2, 0, "c"), overlay(3, 0, "d")], [(MOVE, 1), (UPDATE, 2), (ADD, 3)]),
+        ([overlay(1, 5, "a"), overlay(2, 0, "c"), overlay(3, 0, "d")], []),
+        ([overlay(3, 0, "d"), overlay(4, 0, "e")], [(REMOVE, 1), (REMOVE, 2), (ADD, 4)]),
+        ([overlay(3, 0, "d"), overlay(4, 0, "e"), overlay(5, 0, "f")], [(ADD, 5)]),
+    ]
+    for i, (overlays, expected) in enumerate(steps):
+        ops = [(op, key) for op, key, _ in differ.render(overlays)]
+        assert ops == expected, f"第 {i} 帧操作不符：{ops} != {expected}"
+        shown = {key: (w['x'], w['text']) for key, w in renderer.windows.items()}
+        assert shown == {o['id']: (o['x'], o['text']) for o in overlays}, f"第 {i} 帧屏幕内容不符：{shown}"
+
+    # 1、2 移除后空出的两个窗口被 4、5 复用，总共只建过 3 个窗口
+    assert renderer.created == 3 and renderer.reused == 2, (renderer.created, renderer.reused)
+    assert sorted(w['handle'] for w in renderer.windows.values()) == [1, 2, 3]
+    differ.clear()
+    assert not renderer.windows and len(renderer.idle) == 3
+    print("固定序列：操作、屏幕内容和窗口复用均符合预期")
+
+
+def random_frames(seed, frames, blocks):
+    # 模拟屏幕：每帧部分块滚动、部分改字、部分消失、部分新出现
+    rng = random.Random(seed)
+    next_id = 0
+    current = {}
+    for _ in range(frames):
+        for key in list(current):
+            roll = rng.random()
+            if roll < 0.05:
+                del current[key]
+            elif roll < 0.15:
+                x, y, text = current[key]
+                current[key] = (x, y + rng.randint(-30, 30), text)
+            elif roll < 0.2:
+                x, y, _ = current[key]
+                current[key] = (x, y, f"t{rng.random():.6f}")
+        while len(current) < blocks:
+            next_id += 1
+            current[next_id] = (rng.randint(0, 1800), rng.randint(0, 1000), f"t{rng.random():.6f}")
+        yield [make_overlay(key, x, y, 200, 24, text, 14) for key, (x, y, text) in current.items()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="无界面跑渲染差分：校验操作序列和窗口复用，统计相对每帧重建省掉的窗口操作")
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--blocks", type=int, default=80)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    check_sequence()
+
+    renderer = FakeRenderer(max_idle=args.blocks)
+    differ = RenderDiffer(renderer)
+    shown = 0
+    start = time.perf_counter()
+    for overlays in random_frames(args.seed, args.frames, args.blocks):
+        differ.render(overlays)
+        shown += len(overlays)
+        assert set(renderer.windows) == {o['id'] for o in overlays}
+    elapsed = time.perf_counter() - start
+
+    counts = differ.counts
+    touched = counts[ADD] + counts[MOVE] + counts[UPDATE] + counts[REMOVE]
+    print(f"{args.frames} 帧 x {args.blocks} 块：差分 {elapsed / args.frames * 1000:.3f} ms/帧；"
+          f"窗口操作 {touched} 次（每帧全部重建为 {shown * 2} 次），"
+          f"新建窗口 {renderer.created} 个，复用 {renderer.reused} 次；{counts}")
+
+
+if __name__ == "__main__":
+    main()
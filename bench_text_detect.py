@@ -0,0 +1,48 @@
+import argparse
+import time
+
+from bench_preprocess import recall
+from frame_source import ImageDirFrameSource
+from ocr_translate_core import ocr_words
+from text_detect import assign_region_words, detect_text_regions, region_coverage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比整帧 OCR 与“文字区域检测 + 区域 OCR”的耗时和召回率")
+    parser.add_argument("corpus", nargs="*", default=["debug_frame.png"])
+    parser.add_argument("--cell", type=int, default=16)
+    parser.add_argument("--padding", type=int, default=12)
+    args = parser.parse_args()
+
+    full_total = region_total = 0.0
+    rates = []
+    for path in args.corpus:
+        source = ImageDirFrameSource(path)
+        for frame_path, frame in zip(source.paths, source.frames()):
+            start = time.perf_counter()
+            reference = ocr_words(frame, scale=1.0)
+            full_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            regions = detect_text_regions(frame, cell=args.cell, padding=args.padding)
+            detect_time = time.perf_counter() - start
+            region_words = [ocr_words(frame.crop((left, top, right, bottom)), offset_x=left, offset_y=top, scale=1.0)
+                            for left, top, right, bottom in regions]
+            words = assign_region_words(regions, region_words)
+            region_time = time.perf_counter() - start
+
+            rate = recall(reference, words)
+            rates.append(rate)
+            full_total += full_time
+            region_total += region_time
+            print(f"{frame_path}: 整帧 {full_time * 1000:.0f} ms / {len(reference)} 词；"
+                  f"检测 {detect_time * 1000:.0f} ms，{len(regions)} 个区域，覆盖 {region_coverage(regions, frame.size):.0%}，"
+                  f"检测+区域 OCR {region_time * 1000:.0f} ms / {len(words)} 词，召回 {rate:.1%}")
+
+    if rates:
+        print(f"合计：整帧 {full_total:.2f}s，区域 {region_total:.2f}s，x{full_total / max(region_total, 1e-9):.2f}，"
+              f"平均召回 {sum(rates) / len(rates):.1%}")
+
+
+if __name__ == "__main__":
+    main()
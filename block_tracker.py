@@ -0,0 +1,130 @@
+import itertools
+import threading
+from difflib import SequenceMatcher
+
+
+def box_iou(a, b):
+    left = max(a['left'], b['left'])
+    top = max(a['top'], b['top'])
+    right = min(a['left'] + a['width'], b['left'] + b['width'])
+    bottom = min(a['top'] + a['height'], b['top'] + b['height'])
+    inter = max(0.0, right - left) * max(0.0, bottom - top)
+    union = a['width'] * a['height'] + b['width'] * b['height'] - inter
+    return inter / union if union > 0 else 0.0
+
+
+def text_similarity(a, b):
+    if a == b:
+        return 1.0
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    # quick_ratio 是上界，先用它剪枝
+    if matcher.quick_ratio() < 0.5:
+        return 0.0
+    return matcher.ratio()
+
+
+class BlockTracker:
+    """
+    跨帧文本块跟踪：按框 IoU 和文字相似度把新块匹配到上一帧的块，给块分配稳定的 id。
+    每个块写入 'id' 和 'status'：
+      same    文字和位置都没变
+      moved   文字没变，只是位置变了（滚动等），沿用原来的译文
+      changed 与旧块是同一个位置但文字变了，需要重新翻译
+      new     没有匹配到旧块
+    文字没变的块带上 'translation'（之前记住的译文），其余块为 None。
+    """
+
+    def __init__(self, iou_threshold=0.3, text_threshold=0.6, max_shift=3.0, move_tolerance=1.0):
+        self.iou_threshold = iou_threshold
+        self.text_threshold = text_threshold
+        # 文字完全相同时，允许的最大位移（以块高度为单位），覆盖小幅滚动
+        self.max_shift = max_shift
+        self.move_tolerance = move_tolerance
+        self._tracks = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # 上一次 update 中消失（没有匹配到新块）的旧块数量
+        self.removed = 0
+
+    def _score(self, old, new):
+        iou = box_iou(old, new)
+        if old['text'] == new['text']:
+            dx = abs(old['left'] - new['left'])
+            dy = abs(old['top'] - new['top'])
+            limit = self.max_shift * max(old['height'], new['height'], 1.0)
+            if iou > 0 or (dx <= limit and dy <= limit):
+                return 2.0 + iou
+            return None
+        if iou < self.iou_threshold:
+            return None
+        similarity = text_similarity(old['text'], new['text'])
+        if similarity < self.text_threshold:
+            return None
+        return iou + similarity
+
+    def update(self, blocks):
+        with self._lock:
+            previous = self._tracks
+            candidates = []
+            for j, block in enumerate(blocks):
+                for track_id, old in previous.items():
+                    score = self._score(old, block)
+                    if score is not None:
+                        candidates.append((score, track_id, j))
+            # 贪心：分数高的先配对
+            candidates.sort(key=lambda c: -c[0])
+            assigned = {}
+            used = set()
+            for score, track_id, j in candidates:
+                if j in assigned or track_id in used:
+                    continue
+                assigned[j] = track_id
+                used.add(track_id)
+
+            tracks = {}
+            for j, block in enumerate(blocks):
+                track_id = assigned.get(j)
+                old = previous.get(track_id) if track_id is not None else None
+                if old is None:
+                    track_id = next(self._ids)
+                    status = 'new'
+                    translation = None
+                elif old['text'] != block['text']:
+                    status = 'changed'
+                    translation = None
+                else:
+                    translation = old.get('translation')
+                    moved = (abs(old['left'] - block['left']) > self.move_tolerance or
+                             abs(old['top'] - block['top']) > self.move_tolerance or
+                             abs(old['width'] - block['width']) > self.move_tolerance or
+                             abs(old['height'] - block['height']) > self.move_tolerance)
+                    status = 'moved' if moved else 'same'
+                block['id'] = track_id
+                block['status'] = status
+                block['translation'] = translation
+                tracks[track_id] = {
+                    'text': block['text'],
+                    'left': block['left'],
+                    'top': block['top'],
+                    'width': block['width'],
+                    'height': block['height'],
+                    'translation': translation
+                }
+            self.removed = len(previous) - len(used)
+            self._tracks = tracks
+            return blocks
+
+    def unchanged(self, blocks):
+        # 本帧所有块都与上一帧一致、都已有译文且没有块消失，屏幕上的翻译无需更新
+        return self.removed == 0 and all(b['status'] == 'same' and b['translation'] is not None for b in blocks)
+
+    def remember(self, track_id, translation):
+        # 译文回填到跟踪记录，下一帧文字不变时直接复用
+        with self._lock:
+            track = self._tracks.get(track_id)
+            if track is not None:
+                track['translation'] = translation
+
+    def reset(self):
+        with self._lock:
+            self._tracks = {}
@@ -0,0 +1,114 @@
+import io
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+
+class DebugRecorder:
+    """
+    调试录制：默认关闭。开启后每个周期的帧交给后台线程压缩成 PNG 字节，连同 OCR 文本块和译文进入内存环形缓冲，
+    缓冲同时受条数 capacity 和总字节数 max_bytes 限制；dump() 时把最近 N 个周期交给后台线程写盘，
+    输出目录可直接用 ImageDirFrameSource 回放。压缩跟不上时丢帧，不堆积原始帧。
+    """
+
+    def __init__(self, capacity=30, out_dir="debug_recordings", enabled=False, max_bytes=256 * 1024 * 1024):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.out_dir = out_dir
+        self.enabled = enabled
+        self._buffer = deque()
+        self._buffer_bytes = 0
+        self._lock = threading.Lock()
+        # 待压缩的原始帧最多排两帧
+        self._pending = queue.Queue(maxsize=2)
+        self._jobs = queue.Queue()
+        self._writer = None
+        self.dropped = 0
+
+    def record(self, frame, blocks=None, translations=None):
+        if not self.enabled:
+            return
+        self._ensure_writer()
+        try:
+            self._pending.put_nowait((time.time(), frame, blocks, translations))
+        except queue.Full:
+            self.dropped += 1
+
+    def dump(self, last=None):
+        """把最近 last 个周期（默认全部）写到新目录，立即返回目录路径，写盘在后台进行。"""
+        with self._lock:
+            entries = list(self._buffer)
+        if last is not None:
+            entries = entries[-last:]
+        if not entries:
+            print("调试缓冲为空，没有可导出的帧")
+            return None
+
+        now = time.time()
+        folder = os.path.join(self.out_dir, time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}")
+        self._jobs.put((folder, entries))
+        self._ensure_writer()
+        print(f"导出最近 {len(entries)} 帧到 {folder}")
+        return folder
+
+    def buffered_bytes(self):
+        with self._lock:
+            return self._buffer_bytes
+
+    def _ensure_writer(self):
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, name="debug-recorder", daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            # 导出优先，其次压缩新帧
+            try:
+                folder, entries = self._jobs.get_nowait()
+            except queue.Empty:
+                try:
+                    entry = self._pending.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                try:
+                    self._store(*entry)
+                except Exception as e:
+                    print("调试帧压缩失败：", e)
+                continue
+            try:
+                self._write(folder, entries)
+            except Exception as e:
+                print("调试帧写盘失败：", e)
+
+    def _store(self, timestamp, frame, blocks, translations):
+        out = io.BytesIO()
+        # compress_level=1：速度优先，屏幕截图压缩后通常只有原始大小的几十分之一
+        frame.save(out, format="PNG", compress_level=1)
+        data = out.getvalue()
+        with self._lock:
+            self._buffer.append((timestamp, data, frame.size, blocks, translations))
+            self._buffer_bytes += len(data)
+            while self._buffer and (len(self._buffer) > self.capacity or self._buffer_bytes > self.max_bytes):
+                self._buffer_bytes -= len(self._buffer.popleft()[1])
+
+    def _write(self, folder, entries):
+        os.makedirs(folder, exist_ok=True)
+        for i, (timestamp, data, size, blocks, translations) in enumerate(entries):
+            name = f"frame_{i:04d}"
+            with open(os.path.join(folder, name + ".png"), "wb") as f:
+                f.write(data)
+            with open(os.path.join(folder, name + ".json"), "w", encoding="utf-8") as f:
+                json.dump({
+                    'timestamp': timestamp,
+                    'size': list(size),
+                    'blocks': blocks or [],
+                    'translations': translations or []
+                }, f, ensure_ascii=False, indent=2)
+
+    def clear(self):
+        with self._lock:
+            self._buffer.clear()
+            self._buffer_bytes = 0
@@ -0,0 +1,102 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class FakeTranslateServer:
+    """
+    本地 LibreTranslate 替身：接受 /translate 的表单或 JSON 请求（q 可以是字符串或数组），
+    按配置的延迟 + 抖动返回“[目标语言] 原文”，用于基准测试和离线调试。
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.05, jitter=0.0, per_text=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.per_text = per_text
+        self.requests = 0
+        self.texts = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/translate"
+
+    def _delay(self, count):
+        with self._lock:
+            self.requests += 1
+            self.texts += count
+            jitter = self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.latency + jitter + self.per_text * count)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                if self.path != "/translate":
+                    self.send_error(404)
+                    return
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.headers.get("Content-Type", "").startswith("application/json"):
+                    payload = json.loads(body or b"{}")
+                else:
+                    payload = {k: v[0] for k, v in parse_qs(body.decode()).items()}
+                q = payload.get("q", "")
+                target = payload.get("target", "zh")
+                texts = q if isinstance(q, list) else [q]
+
+                time.sleep(server._delay(len(texts)))
+                translated = [f"[{target}] {text}" for text in texts]
+                data = json.dumps({"translatedText": translated if isinstance(q, list) else translated[0]},
+                                  ensure_ascii=False).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-translate", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地假翻译服务（LibreTranslate 接口）")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.05, help="每个请求的基础延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.02, help="延迟随机抖动幅度（秒）")
+    parser.add_argument("--per-text", type=float, default=0.0, help="每条文本额外延迟（秒）")
+    args = parser.parse_args()
+
+    server = FakeTranslateServer(port=args.port, latency=args.latency, jitter=args.jitter, per_text=args.per_text)
+    print("假翻译服务：", server.url)
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
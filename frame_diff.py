@@ -0,0 +1,75 @@
+import numpy as np
+from PIL import Image
+
+
+def to_small_gray(img, downsample):
+    """把 PIL 图像或 NumPy 帧缩小 downsample 倍并转灰度（float32）。"""
+    if isinstance(img, Image.Image):
+        # 先转灰度再做盒式缩小，比先缩小 RGBA 快得多，且平均值对细笔画变化也敏感
+        small = img.convert("L")
+        if downsample > 1:
+            small = small.reduce(downsample)
+        return np.asarray(small, dtype=np.float32)
+    arr = np.asarray(img)
+    if downsample > 1:
+        arr = arr[::downsample, ::downsample]
+    if arr.ndim == 3:
+        arr = arr[..., 0] * 0.299 + arr[..., 1] * 0.587 + arr[..., 2] * 0.114
+    return arr.astype(np.float32)
+
+
+class FrameChangeDetector:
+    """
+    帧变化检测：把画面缩小后按 tile 比较，只花几毫秒判断屏幕是否变化，
+    并给出哪些 tile 变了（dirty map）。
+    tile_size 以原图像素为单位，需是 downsample 的整数倍。
+    """
+
+    def __init__(self, tile_size=128, downsample=4, pixel_threshold=12, min_changed_pixels=2):
+        self.tile_size = tile_size
+        self.downsample = downsample
+        self.pixel_threshold = pixel_threshold
+        self.min_changed_pixels = min_changed_pixels
+        self._previous = None
+        self.image_size = None
+
+    def reset(self):
+        self._previous = None
+
+    def grid_shape(self):
+        width, height = self.image_size
+        return (-(-height // self.tile_size), -(-width // self.tile_size))
+
+    def update(self, img):
+        """返回 (rows, cols) 的布尔数组，True 表示该 tile 与上一帧不同；首帧或尺寸变化时全为 True。"""
+        if isinstance(img, Image.Image):
+            size = img.size
+        else:
+            size = (img.shape[1], img.shape[0])
+        current = to_small_gray(img, self.downsample)
+
+        if self._previous is None or self._previous.shape != current.shape or size != self.image_size:
+            self.image_size = size
+            self._previous = current
+            return np.ones(self.grid_shape(), dtype=bool)
+
+        changed = np.abs(current - self._previous) > self.pixel_threshold
+        self._previous = current
+
+        # 按 tile 统计变化像素数：补齐到整 tile 后 reshape 求和
+        cell = self.tile_size // self.downsample
+        rows, cols = self.grid_shape()
+        padded = np.zeros((rows * cell, cols * cell), dtype=np.int32)
+        padded[:changed.shape[0], :changed.shape[1]] = changed
+        counts = padded.reshape(rows, cell, cols, cell).sum(axis=(1, 3))
+        return counts >= self.min_changed_pixels
+
+    def has_changed(self, img):
+        return bool(self.update(img).any())
+
+    def tile_rect(self, row, col):
+        # 返回 tile 在原图中的 (left, top, right, bottom)
+        width, height = self.image_size
+        left = col * self.tile_size
+        top = row * self.tile_size
+        return (left, top, min(left + self.tile_size, width), min(top + self.tile_size, height))
@@ -0,0 +1,70 @@
+import numpy as np
+
+from frame_diff import to_small_gray
+
+
+def sharpness(gray):
+    """拉普拉斯方差：越大越清晰，运动模糊 / 失焦的帧明显偏小。gray 为二维 float 数组。"""
+    if gray.shape[0] < 3 or gray.shape[1] < 3:
+        return 0.0
+    center = gray[1:-1, 1:-1]
+    lap = gray[:-2, 1:-1] + gray[2:, 1:-1] + gray[1:-1, :-2] + gray[1:-1, 2:] - 4.0 * center
+    return float(lap.var())
+
+
+def motion(prev_gray, gray):
+    """相邻两帧缩小灰度图的平均绝对差，作为画面运动量的估计。"""
+    if prev_gray is None or prev_gray.shape != gray.shape:
+        return float('inf')
+    return float(np.abs(gray - prev_gray).mean())
+
+
+class FrameSelector:
+    """
+    摄像头帧筛选：画面连续 stable_frames 帧运动量低于 motion_threshold 视为稳定，
+    稳定窗口里挑最清晰的一帧交给 OCR，同一个稳定画面只交一次，直到画面再次运动。
+    清晰度低于 min_sharpness 的帧不参与挑选。
+    """
+
+    def __init__(self, stable_frames=3, motion_threshold=3.0, min_sharpness=20.0, downsample=4):
+        self.stable_frames = stable_frames
+        self.motion_threshold = motion_threshold
+        self.min_sharpness = min_sharpness
+        self.downsample = downsample
+        self.reset()
+
+    def reset(self):
+        self._prev = None
+        self._stable = 0
+        self._best = None
+        self._best_score = -1.0
+        self._emitted = False
+        self.last_motion = None
+        self.last_sharpness = None
+
+    def push(self, img):
+        """送入一帧；稳定窗口凑满时返回窗口中最清晰的一帧，否则返回 None。"""
+        gray = to_small_gray(img, self.downsample)
+        self.last_motion = motion(self._prev, gray)
+        self.last_sharpness = sharpness(gray)
+        self._prev = gray
+
+        if self.last_motion > self.motion_threshold:
+            # 画面在动：重新开始计数，之前交过的画面作废
+            self._stable = 1
+            self._best = None
+            self._best_score = -1.0
+            self._emitted = False
+        else:
+            self._stable += 1
+
+        if self.last_sharpness >= self.min_sharpness and self.last_sharpness > self._best_score:
+            self._best = img
+            self._best_score = self.last_sharpness
+
+        if self._emitted or self._stable < self.stable_frames or self._best is None:
+            return None
+        self._emitted = True
+        best = self._best
+        self._best = None
+        return best
@@ -0,0 +1,190 @@
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+
+class FrameSource:
+    """
+    帧来源接口：read() 返回一帧 PIL 图像，没有更多帧时返回 None。
+    frames() 按指定帧率产出帧，可以脱离 Quartz / AppKit 驱动 OCR 与翻译。
+    """
+
+    def read(self):
+        raise NotImplementedError
+
+    def frames(self, rate=None, limit=None, as_array=False):
+        interval = 1.0 / rate if rate else 0.0
+        count = 0
+        next_time = time.monotonic()
+        while limit is None or count < limit:
+            frame = self.read()
+            if frame is None:
+                return
+            yield np.asarray(frame) if as_array else frame
+            count += 1
+            if interval:
+                # 以固定节拍产出，处理慢于节拍时不累积欠账
+                next_time = max(next_time + interval, time.monotonic())
+                time.sleep(max(0.0, next_time - time.monotonic()))
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MssFrameSource(FrameSource):
+    """用 mss 截屏，跨平台（Linux / Windows / macOS）。"""
+
+    def __init__(self, monitor=1, region=None):
+        import mss
+
+        self._sct = mss.mss()
+        if region is not None:
+            left, top, width, height = region
+            self.monitor = {'left': left, 'top': top, 'width': width, 'height': height}
+        else:
+            self.monitor = self._sct.monitors[monitor]
+
+    def read(self):
+        shot = self._sct.grab(self.monitor)
+        # mss 给的是 BGRA 原始字节，直接按 raw 解码，不经过 PNG
+        return Image.frombuffer("RGB", shot.size, shot.bgra, "raw", "BGRX", 0, 1)
+
+    def close(self):
+        self._sct.close()
+
+
+def _cgimage_layout(cg_image):
+    # 根据 bitmap info 判断 32 位像素的字节顺序，返回 PIL 的 raw 模式
+    import Quartz
+
+    info = Quartz.CGImageGetBitmapInfo(cg_image)
+    alpha = Quartz.CGImageGetAlphaInfo(cg_image)
+    little_endian = (info & Quartz.kCGBitmapByteOrderMask) == Quartz.kCGBitmapByteOrder32Little
+    alpha_first = alpha in (
+        Quartz.kCGImageAlphaPremultipliedFirst,
+        Quartz.kCGImageAlphaFirst,
+        Quartz.kCGImageAlphaNoneSkipFirst
+    )
+    if little_endian:
+        return "BGRA" if alpha_first else "ABGR"
+    return "ARGB" if alpha_first else "RGBA"
+
+
+def cgimage_to_pil(cg_image):
+    # 直接按 stride 解码原始像素，省掉 NSImage -> TIFF -> NSBitmapImageRep 的编解码；
+    # CGDataProviderCopyData 会复制一次像素，frombuffer 随后直接引用这份数据，不再复制
+    import Quartz
+
+    width = Quartz.CGImageGetWidth(cg_image)
+    height = Quartz.CGImageGetHeight(cg_image)
+    stride = Quartz.CGImageGetBytesPerRow(cg_image)
+    data = Quartz.CGDataProviderCopyData(Quartz.CGImageGetDataProvider(cg_image))
+    return Image.frombuffer("RGBA", (width, height), data, "raw", _cgimage_layout(cg_image), stride, 1)
+
+
+class QuartzFrameSource(FrameSource):
+    """macOS 主屏截图（CGWindowListCreateImage），Retina 下为 2x 像素。"""
+
+    def __init__(self, rect=None):
+        self.rect = rect
+
+    def grab_cgimage(self):
+        import Quartz
+        from AppKit import NSScreen
+
+        rect = self.rect
+        if rect is None:
+            frame = NSScreen.mainScreen().frame()
+            rect = (0, 0, int(frame.size.width), int(frame.size.height))
+        return Quartz.CGWindowListCreateImage(
+            Quartz.CGRectMake(*rect),
+            Quartz.kCGWindowListOptionOnScreenOnly,
+            Quartz.kCGNullWindowID,
+            Quartz.kCGWindowImageDefault
+        )
+
+    def read(self):
+        cg_image = self.grab_cgimage()
+        if cg_image is None:
+            print("截图失败（需要屏幕录制权限）")
+            return None
+        return cgimage_to_pil(cg_image)
+
+
+class ImageDirFrameSource(FrameSource):
+    """按文件名顺序回放目录里的截图（也可以传单个图片文件）。"""
+
+    def __init__(self, path, loop=False):
+        if os.path.isdir(path):
+            self.paths = sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            )
+        else:
+            self.paths = [path]
+        if not self.paths:
+            raise ValueError(f"目录里没有图片：{path}")
+        self.loop = loop
+        self._index = 0
+
+    def read(self):
+        if self._index >= len(self.paths):
+            if not self.loop:
+                return None
+            self._index = 0
+        img = Image.open(self.paths[self._index])
+        img.load()
+        self._index += 1
+        return img
+
+
+class VideoFileFrameSource(FrameSource):
+    """用 OpenCV 回放视频文件；传整数时打开对应编号的摄像头。"""
+
+    def __init__(self, path, loop=False):
+        import cv2
+
+        self._cv2 = cv2
+        self.path = path
+        self.loop = loop and not isinstance(path, int)
+        self._cap = cv2.VideoCapture(path)
+        # 摄像头暂时打不开时不报错，read() 返回 None 由调用方重试
+        if not self._cap.isOpened() and not isinstance(path, int):
+            raise ValueError(f"无法打开视频：{path}")
+
+    def read(self):
+        ret, frame = self._cap.read()
+        if not ret and self.loop:
+            self._cap.set(self._cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._cap.read()
+        if not ret:
+            return None
+        frame_rgb = self._cv2.cvtColor(frame, self._cv2.COLOR_BGR2RGB)
+        return Image.fromarray(frame_rgb)
+
+    def close(self):
+        self._cap.release()
+
+
+def open_frame_source(kind, path=None, loop=False, monitor=1):
+    if kind == 'mss':
+        return MssFrameSource(monitor=monitor)
+    if kind == 'quartz':
+        return QuartzFrameSource()
+    if kind == 'dir':
+        return ImageDirFrameSource(path, loop=loop)
+    if kind == 'video':
+        return VideoFileFrameSource(path, loop=loop)
+    if kind == 'camera':
+        return VideoFileFrameSource(int(path or 0))
+    raise ValueError(f"未知帧来源：{kind}")
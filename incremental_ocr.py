@@ -0,0 +1,137 @@
+from block_tracker import box_iou
+from frame_diff import FrameChangeDetector
+from metrics import metrics
+from ocr_translate_core import ocr_words, ocr_frame_words, group_words_into_blocks
+
+
+def dirty_regions(dirty):
+    """把 dirty tile 布尔网格合并成矩形，返回 [(row0, col0, row1, col1), ...]（右下开区间）。"""
+    regions = []
+    open_regions = {}
+    rows, cols = dirty.shape
+    for row in range(rows):
+        # 当前行的连续 dirty 段
+        runs = []
+        col = 0
+        while col < cols:
+            if dirty[row, col]:
+                start = col
+                while col < cols and dirty[row, col]:
+                    col += 1
+                runs.append((start, col))
+            else:
+                col += 1
+
+        next_open = {}
+        for run in runs:
+            # 与上一行列范围完全相同的段向下延伸，否则新开一个矩形
+            if run in open_regions:
+                row0 = open_regions.pop(run)
+            else:
+                row0 = row
+            next_open[run] = row0
+        for (col0, col1), row0 in open_regions.items():
+            regions.append((row0, col0, row, col1))
+        open_regions = next_open
+    for (col0, col1), row0 in open_regions.items():
+        regions.append((row0, col0, rows, col1))
+    return regions
+
+
+def _same_word(a, b, min_iou):
+    # 框大致重合，或文字相同且框有重叠（小单词几个像素的偏差就会让 IoU 掉得很低）
+    iou = box_iou(a, b)
+    return iou >= min_iou or (iou > 0 and a['text'] == b['text'])
+
+
+def _center_in(word, rect):
+    # 单词按中心点归属：中心落在哪个矩形就属于哪个，跨界单词不会被两边同时认领
+    left, top, right, bottom = rect
+    center_x = word['left'] + word['width'] / 2
+    center_y = word['top'] + word['height'] / 2
+    return left <= center_x < right and top <= center_y < bottom
+
+
+class IncrementalOcr:
+    """
+    增量 OCR：按 tile 维护 dirty map，只对变化的区域（外扩 padding 避免切断单词）重新识别，
+    结果并入上一帧缓存的单词集合，OCR 开销随变化面积而不是屏幕尺寸增长。
+    """
+
+    def __init__(self, tile_size=128, padding=32, full_ocr_ratio=0.5, detector=None):
+        self.detector = detector or FrameChangeDetector(tile_size=tile_size)
+        self.padding = padding
+        # dirty 面积超过这个比例时直接整帧识别，比很多小块更快
+        self.full_ocr_ratio = full_ocr_ratio
+        # 两个框 IoU 不低于这个值视为同一个单词
+        self.same_word_iou = 0.5
+        self.words = None
+        self.blocks = []
+
+    def reset(self):
+        self.detector.reset()
+        self.words = None
+        self.blocks = []
+
+    def update(self, img):
+        """返回 (单词列表, 是否有变化)。"""
+        dirty = self.detector.update(img)
+        if not dirty.any() and self.words is not None:
+            return self.words, False
+
+        if self.words is None or dirty.mean() >= self.full_ocr_ratio:
+            self.words = ocr_frame_words(img)
+            return self.words, True
+
+        image_width, image_height = img.size
+        rects = []
+        for row0, col0, row1, col1 in dirty_regions(dirty):
+            left, top, _, _ = self.detector.tile_rect(row0, col0)
+            _, _, right, bottom = self.detector.tile_rect(row1 - 1, col1 - 1)
+            rects.append((left, top, right, bottom))
+
+        # 单词按中心点归属：中心落在变化区域里的旧单词作废，由对应矩形的裁剪重新识别
+        kept, dropped = [], []
+        for w in self.words:
+            (dropped if any(_center_in(w, rect) for rect in rects) else kept).append(w)
+
+        # 先收下中心落在本矩形内的单词；裁剪框有几个像素偏差，中心可能刚好跨到相邻矩形或矩形外，
+        # 这类单词作为候补，只在没有别的裁剪认领、且落在变化区域或顶替了作废的旧单词时采用
+        owned, spare = [], []
+        for rect in rects:
+            left, top, right, bottom = rect
+            crop_box = (
+                max(0, left - self.padding),
+                max(0, top - self.padding),
+                min(image_width, right + self.padding),
+                min(image_height, bottom + self.padding)
+            )
+            for w in ocr_words(img.crop(crop_box), offset_x=crop_box[0], offset_y=crop_box[1]):
+                if _center_in(w, rect):
+                    owned.append(w)
+                elif (any(_center_in(w, other) for other in rects) or
+                      any(_same_word(w, old, self.same_word_iou) for old in dropped)):
+                    spare.append(w)
+                # 其余是 padding 区里没变的单词，以缓存为准
+
+        fresh_words = []
+        for w in owned + spare:
+            # 相邻裁剪都识别到的同一个单词只留一份
+            if not any(_same_word(w, other, self.same_word_iou) for other in fresh_words):
+                fresh_words.append(w)
+
+        # 框偏差让缓存里的同一个单词中心落在矩形外时，以新结果为准
+        words = [w for w in kept if not any(_same_word(w, f, self.same_word_iou) for f in fresh_words)]
+        words.extend(fresh_words)
+        words.sort(key=lambda w: (w['top'], w['left']))
+        self.words = words
+        return self.words, True
+
+    def get_text_blocks(self, img, scale_x=0.5, scale_y=0.5):
+        """返回 (文本块, 是否有变化)；没有变化时直接返回上一帧的块。"""
+        with metrics.timer("ocr"):
+            words, changed = self.update(img)
+        if changed:
+            with metrics.timer("grouping"):
+                self.blocks = group_words_into_blocks(words, scale_x, scale_y)
+        return self.blocks, changed
@@ -0,0 +1,79 @@
+import numpy as np
+
+
+def group_words_into_blocks(words, scale_x=0.5, scale_y=0.5):
+    """
+    把单词分组成行、再在行内按间距切成段落，返回按 top 排序的文本块。
+    一次排序 + 向量化运算，O(n log n)；结果与原先 DBSCAN(eps=1.0, min_samples=1) 的分组完全一致。
+    """
+    if not words:
+        return []
+
+    n = len(words)
+    lefts = np.fromiter((w['left'] for w in words), dtype=np.int64, count=n)
+    tops = np.fromiter((w['top'] for w in words), dtype=np.int64, count=n)
+    widths = np.fromiter((w['width'] for w in words), dtype=np.int64, count=n)
+    heights = np.fromiter((w['height'] for w in words), dtype=np.int64, count=n)
+    rights = np.fromiter((w['right'] for w in words), dtype=np.int64, count=n)
+    bottoms = np.fromiter((w['bottom'] for w in words), dtype=np.int64, count=n)
+    index = np.arange(n)
+
+    # Step 1: 行 = 一维 y 中心上距离 <= 1 个平均字高的连通分量（等价于 min_samples=1 的 DBSCAN）
+    avg_height = heights.mean() or 1.0
+    y = (tops + heights / 2) / avg_height
+    by_y = np.argsort(y, kind='stable')
+    new_line = np.empty(n, dtype=bool)
+    new_line[0] = True
+    new_line[1:] = np.diff(y[by_y]) > 1.0
+    component = np.empty(n, dtype=np.int64)
+    component[by_y] = np.cumsum(new_line) - 1
+
+    # DBSCAN 按下标顺序给簇编号：按每行最小下标排行序
+    starts = np.flatnonzero(new_line)
+    first_index = np.minimum.reduceat(by_y, starts) if n > 1 else by_y[:1]
+    line_rank = np.empty(len(starts), dtype=np.int64)
+    line_rank[np.argsort(first_index, kind='stable')] = np.arange(len(starts))
+    line_of = line_rank[component]
+
+    # Step 2: 行内按 left 排序（相同 left 保持原顺序），间距超过行平均词宽 1.5 倍就切段
+    order = np.lexsort((index, lefts, line_of))
+    line_sorted = line_of[order]
+    counts = np.bincount(line_of)
+    avg_width = np.bincount(line_of, weights=widths) / counts
+    avg_width[avg_width == 0] = 1.0
+
+    new_para = np.empty(n, dtype=bool)
+    new_para[0] = True
+    same_line = line_sorted[1:] == line_sorted[:-1]
+    gaps = lefts[order][1:] - rights[order][:-1]
+    new_para[1:] = ~same_line | (gaps > avg_width[line_sorted[1:]] * 1.5)
+
+    para_starts = np.flatnonzero(new_para)
+    anchors = order[para_starts]
+    para_rights = np.maximum.reduceat(rights[order], para_starts)
+    para_bottoms = np.maximum.reduceat(bottoms[order], para_starts)
+
+    texts = [words[i]['text'] for i in order.tolist()]
+    bounds = para_starts.tolist() + [n]
+
+    results = []
+    for p, anchor in enumerate(anchors.tolist()):
+        # 使用第一个词作为 anchor 显示点
+        left = words[anchor]['left']
+        top = words[anchor]['top']
+        right = int(para_rights[p])
+        bottom = int(para_bottoms[p])
+        results.append({
+            'text': " ".join(texts[bounds[p]:bounds[p + 1]]),
+            'left': left * scale_x,
+            'top': top * scale_y,
+            'width': (right - left) * scale_x,
+            'height': (bottom - top) * scale_y,
+            'original_top': top
+        })
+
+    # 按原始 top 排序（稳定排序，同一 top 保持段落顺序）
+    results.sort(key=lambda b: b['original_top'])
+    for b in results:
+        del b['original_top']
+    return results
@@ -2,9 +2,7 @@ import sys
 import objc
 import time
 import threading
-import cv2
 from objc import selector
-from PIL import Image
 from AppKit import (
     NSApplication, NSWindow, NSBackingStoreBuffered,
     NSBorderlessWindowMask, NSMakeRect, NSColor, NSTextField,
@@ -12,7 +10,11 @@ from AppKit import (
     NSWindowCollectionBehaviorFullScreenAuxiliary, NSScreen
 )
 from Foundation import NSObject, NSAutoreleasePool, NSArray, NSLock
-from ocr_translate_core import get_text_blocks, translate_batch
+from ocr_translate_core import get_text_blocks, translate_batch, warm_up_translation_engine
+from frame_source import open_frame_source
+from scheduler import AdaptiveScheduler
+from placement import OverlayPlacer
+from frame_quality import FrameSelector
 
 
 class OverlayManager(NSObject):
@@ -39,13 +41,8 @@ class OverlayManager(NSObject):
             offset_x = 0
             offset_y = 0
 
-            occupied_zones = []
-
-            def is_overlapping(x1, y1, w1, h1, zones):
-                for x2, y2, w2, h2 in zones:
-                    if x1 < x2 + w2 and x1 + w1 > x2 and y1 < y2 + h2 and y1 + h1 > y2:
-                        return True
-                return False
+            # 网格索引找不重叠的位置，不再逐个比较已有窗口
+            placer = OverlayPlacer(screen_width, screen_height)
 
             for block, translation in zip(blocks, translations):
                 # 直接使用原始坐标
@@ -59,20 +56,12 @@ class OverlayManager(NSObject):
                 # 避开原文上方
                 y = max(y - 40, 0)
 
-                # 避免与已有窗口重叠
-                while is_overlapping(x, y, actual_w, actual_h, occupied_zones):
-                    y += 50
-                    if y > screen_height - actual_h:
-                        break
-
-                # 限制在屏幕内
-                x = min(max(0, x), screen_width - actual_w - 10)
-                y = min(max(0, y), screen_height - actual_h - 10)
+                # 避免与已有窗口重叠，并限制在屏幕内
+                x, y = placer.place(x, y, actual_w, actual_h)
 
                 # 正式创建窗口
                 win = self._create_overlay_window(x, y, clean_text, test_mode=False)
                 self.active_windows.append(win)
-                occupied_zones.append((x, y, actual_w, actual_h))
         finally:
             self.lock.unlock()
 
@@ -167,23 +156,46 @@ OverlayManager.showTranslatedBlocks_translations_ = selector(
     signature=b'v@:@'
 )
 
-cap = cv2.VideoCapture(2)
+# 摄像头编号；VIDEO_PATH 不为 None 时改为循环回放视频文件，便于离线调试
+CAMERA_INDEX = 2
+VIDEO_PATH = None
+camera = open_frame_source('video', VIDEO_PATH, loop=True) if VIDEO_PATH else open_frame_source('camera', CAMERA_INDEX)
+
+# 采样频率（次/秒）：画面在动时升到 CAPTURE_MAX_RATE，静止时逐步退到 CAPTURE_MIN_RATE；
+# 处理耗时（含 OCR）的 CPU 占比不超过 CAPTURE_CPU_BUDGET
+CAPTURE_MIN_RATE = 1.0
+CAPTURE_MAX_RATE = 10.0
+CAPTURE_CPU_BUDGET = 0.5
+capture_scheduler = AdaptiveScheduler.from_rates(CAPTURE_MIN_RATE, CAPTURE_MAX_RATE, cpu_budget=CAPTURE_CPU_BUDGET)
+
+# 连续 FRAME_STABLE_COUNT 帧基本不动才 OCR，并且只识别其中最清晰的一帧
+FRAME_STABLE_COUNT = 3
+frame_selector = FrameSelector(stable_frames=FRAME_STABLE_COUNT)
 
 def background_loop(manager):
+    warm_up_translation_engine()
     while True:
-        ret, frame = cap.read()
-        if not ret:
+        capture_scheduler.sleep()
+        capture_scheduler.tick()
+        start = time.perf_counter()
+        frame = camera.read()
+        if frame is None:
             print("摄像头读取失败")
-            time.sleep(1)
+            capture_scheduler.record(False)
+            continue
+
+        # 模糊、晃动或已经识别过的画面不做 OCR
+        pil_img = frame_selector.push(frame)
+        moving = frame_selector.last_motion > frame_selector.motion_threshold
+        if pil_img is None:
+            capture_scheduler.record(moving, time.perf_counter() - start)
             continue
 
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        pil_img = Image.fromarray(frame_rgb)
         image_width, image_height = pil_img.size
         blocks = get_text_blocks(pil_img)
+        capture_scheduler.record(True, time.perf_counter() - start)
         texts = [b['text'] for b in blocks]
         if not texts:
-            time.sleep(1)
             continue
 
         translations = translate_batch(texts)
@@ -194,8 +206,6 @@ def background_loop(manager):
             True
         )
 
-        time.sleep(1.5)
-
 def main():
     pool = NSAutoreleasePool.alloc().init()
     app = NSApplication.sharedApplication()
@@ -209,7 +219,7 @@ def main():
 
     app.run()
     del pool
-    cap.release()
+    camera.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -7,10 +7,20 @@ from AppKit import (
     NSApplication, NSWindow, NSBackingStoreBuffered,
     NSBorderlessWindowMask, NSMakeRect, NSColor, NSTextField,
     NSScreenSaverWindowLevel, NSWindowCollectionBehaviorCanJoinAllSpaces,
-    NSWindowCollectionBehaviorFullScreenAuxiliary, NSScreen
+    NSWindowCollectionBehaviorFullScreenAuxiliary, NSScreen, NSWindowSharingNone
 )
 from Foundation import NSObject, NSAutoreleasePool, NSArray, NSLock
-from ocr_translate_core import get_text_blocks, translate_batch
+from ocr_translate_core import translate_batch, warm_up_translation_engine, screen_scale
+from incremental_ocr import IncrementalOcr
+from block_tracker import BlockTracker
+from translation_client import FAILED_TEXT, TIMEOUT_TEXT
+from pipeline import FrameJob, StagedPipeline
+from render_diff import RenderDiffer
+from text_layout import layout_frame
+from scheduler import AdaptiveScheduler
+from frame_source import QuartzFrameSource
+from debug_recorder import DebugRecorder
+from metrics import metrics, COUNT_BUCKETS
 
 # import Quartz
 # import AppKit
@@ -18,140 +28,22 @@ from ocr_translate_core import get_text_blocks, translate_batch
 
 is_lock = True
 
-class OverlayManager(NSObject):
-    def init(self):
-        self = objc.super(OverlayManager, self).init()
-        if self is None:
-            return None
-        self.active_windows = []
-        self.lock = NSLock.alloc().init()
-        return self
-
-    def showTranslatedBlocksTranslations_(self, userInfo):
-        self.lock.lock()
-        try:
-            self._clearAllWindows()
-            blocks, translations, image_width, image_height = userInfo
-
-            screen = NSScreen.mainScreen()
-            screen_width = int(screen.frame().size.width)
-            screen_height = int(screen.frame().size.height)
-
-            # 如果图像已经是全屏，就不用 scale
-            # 只需加少量偏移以避开原文
-            offset_x = 0
-            offset_y = 0
-
-            occupied_zones = []
-
-            def is_overlapping(x1, y1, w1, h1, zones):
-                for x2, y2, w2, h2 in zones:
-                    if x1 < x2 + w2 and x1 + w1 > x2 and y1 < y2 + h2 and y1 + h1 > y2:
-                        return True
-                return False
-
-            for i, (block, translation) in enumerate(zip(blocks, translations)):
-                print(f"[{i}] 坐标: ({block['left']:.1f}, {block['top']:.1f}) 原文: {block['text']} 翻译: {translation}")
-                # 直接使用原始坐标
-                x = int(block['left'])
-                # Flip Y coordinate to match macOS bottom-up coordinate system
-                screen_height = int(screen.frame().size.height)
-                y = screen_height - int(block['top']) - int(block['height'])
-                w = int(block['width'])
-                h = int(block['height'])
-                clean_text = translation.strip().replace("\n\n", "\n")
-
-                win = self._create_overlay_window(x, y, clean_text, max_width=w, max_height=h)
-                self.active_windows.append(win)
-                # self.active_windows.append(win)
-                # occupied_zones.append((x, y, actual_w, actual_h))
-        finally:
-            self.lock.unlock()
-
-    def hide_all_windows(self):
-        for win in self.active_windows:
-            win.orderOut_(None)
-
-    def show_all_windows(self):
-        for win in self.active_windows:
-            win.orderFrontRegardless()
+class OverlayWindowPool:
+    """
+    AppKit renderer：按 key 管理浮窗，remove 时窗口隐藏后放回空闲池，add 时优先复用，
+    不再每帧新建 NSWindow / NSTextField。由 RenderDiffer 驱动，只在主线程调用。
+    """
 
-    def _clearAllWindows(self):
-        for win in self.active_windows:
-            if win.isVisible():
-                win.orderOut_(None)
-        self.active_windows.clear()
+    def __init__(self, max_idle=32):
+        self.windows = {}
+        self.idle = []
+        self.max_idle = max_idle
+        # hide_all() 之后为 True，直到 show_all()
+        self.hidden = False
 
-    def _create_overlay_window(self, x, y, text, test_mode=False, max_width=None, max_height=None):
-        screen = NSScreen.mainScreen()
-        screen_width = int(screen.frame().size.width)
-        screen_height = int(screen.frame().size.height)
-
-        # 初始字体设置
-        font_size = 20
-        char_width = font_size * 0.6
-        padding = 20
-
-        if max_width is None:
-            max_width = screen_width * 0.9
-        if max_height is None:
-            max_height = screen_height * 0.9
-
-        def split_text_by_width(text, max_width, char_width):
-            words = text.split()
-            lines = []
-            current_line = ""
-            for word in words:
-                if len(current_line) == 0:
-                    tentative_line = word
-                else:
-                    tentative_line = current_line + " " + word
-                if len(tentative_line) * char_width <= max_width:
-                    current_line = tentative_line
-                else:
-                    if current_line:
-                        lines.append(current_line)
-                    current_line = word
-            if current_line:
-                lines.append(current_line)
-            return lines
-
-        width = max_width
-        height = max_height
-
-        min_font_size = 8
-        max_font_size = 40
-        font_size = max_font_size
-
-        def fits(text, width, height, font_size):
-            char_width = font_size * 0.6
-            line_height = font_size * 1.5
-            lines = split_text_by_width(text, width - padding, char_width)
-            total_height = len(lines) * line_height + padding
-            max_line_width = max((len(line) * char_width for line in lines), default=0) + padding
-            return total_height <= height and max_line_width <= width, lines
-
-        while font_size >= min_font_size:
-            ok, lines = fits(text, width, height, font_size)
-            if ok:
-                break
-            font_size -= 1
-
-        if font_size < min_font_size:
-            font_size = min_font_size
-            _, lines = fits(text, width, height, font_size)
-
-        if test_mode:
-            rect = NSMakeRect(0, 0, width, height)
-            return width, height
-
-        # 限制最终位置不超屏幕边界
-        x = min(x, screen_width - width - 10)
-        y = min(y, screen_height - height - 10)
-
-        rect = NSMakeRect(x, y, width, height)
+    def _new_window(self):
         win = NSWindow.alloc().initWithContentRect_styleMask_backing_defer_(
-            rect,
+            NSMakeRect(0, 0, 1, 1),
             NSBorderlessWindowMask,
             NSBackingStoreBuffered,
             False
@@ -160,120 +52,266 @@ class OverlayManager(NSObject):
         win.setOpaque_(False)
         win.setBackgroundColor_(NSColor.clearColor())
         win.setIgnoresMouseEvents_(True)
+        # 不参与屏幕截图：截图时不用先隐藏浮窗，OCR 也不会读到自己的译文
+        win.setSharingType_(NSWindowSharingNone)
         win.setCollectionBehavior_(
             NSWindowCollectionBehaviorCanJoinAllSpaces |
             NSWindowCollectionBehaviorFullScreenAuxiliary
         )
 
         semi_black = NSColor.colorWithCalibratedWhite_alpha_(0.0, 0.5)
-        field = NSTextField.alloc().initWithFrame_(NSMakeRect(0, 0, width, height))
-        field.setStringValue_(text)
+        field = NSTextField.alloc().initWithFrame_(NSMakeRect(0, 0, 1, 1))
         field.setEditable_(False)
         field.setBezeled_(False)
         field.setDrawsBackground_(True)
         field.setBackgroundColor_(semi_black)
         field.setTextColor_(NSColor.whiteColor())
-        field.setFont_(field.font().fontWithSize_(font_size))
         field.setUsesSingleLineMode_(False)
         field.cell().setWraps_(True)
         field.cell().setLineBreakMode_(0)
 
         win.setContentView_(field)
-        win.orderFrontRegardless()
+        metrics.inc("overlay_windows_created")
         return win
 
+    def _apply(self, win, overlay):
+        width, height = overlay['width'], overlay['height']
+        win.setFrame_display_(NSMakeRect(overlay['x'], overlay['y'], width, height), False)
+        field = win.contentView()
+        field.setFrame_(NSMakeRect(0, 0, width, height))
+        field.setStringValue_(overlay['text'])
+        field.setFont_(field.font().fontWithSize_(overlay['font_size']))
+
+    def add(self, key, overlay):
+        win = self.idle.pop() if self.idle else self._new_window()
+        self._apply(win, overlay)
+        win.orderFrontRegardless()
+        self.windows[key] = win
+
+    def update(self, key, overlay):
+        self._apply(self.windows[key], overlay)
+
+    def move(self, key, overlay):
+        self.windows[key].setFrameOrigin_((overlay['x'], overlay['y']))
+
+    def remove(self, key):
+        win = self.windows.pop(key)
+        win.orderOut_(None)
+        if len(self.idle) < self.max_idle:
+            self.idle.append(win)
+
+    def hide_all(self):
+        self.hidden = True
+        for win in self.windows.values():
+            win.orderOut_(None)
+
+    def show_all(self):
+        self.hidden = False
+        for win in self.windows.values():
+            win.orderFrontRegardless()
+
 
-OverlayManager.showTranslatedBlocks_translations_ = selector(
-    OverlayManager.showTranslatedBlocksTranslations_,
-    selector=b'showTranslatedBlocks:translations:',
+class OverlayManager(NSObject):
+    def init(self):
+        self = objc.super(OverlayManager, self).init()
+        if self is None:
+            return None
+        self.window_pool = OverlayWindowPool()
+        self.differ = RenderDiffer(self.window_pool)
+        self.lock = NSLock.alloc().init()
+        return self
+
+    def showOverlays_(self, overlays):
+        # overlays 已在渲染线程排好版，这里只按块 id 对比上一帧，
+        # 只有新增 / 移动 / 内容变化 / 消失的浮窗才操作 AppKit
+        self.lock.lock()
+        try:
+            for op, _, _ in self.differ.render(overlays):
+                metrics.inc(f"overlay_{op}")
+            # 锁定期间隐藏过的、这一帧仍然有效的浮窗一起恢复
+            if self.window_pool.hidden:
+                self.window_pool.show_all()
+        finally:
+            self.lock.unlock()
+
+    def hideAllWindows_(self, _):
+        self.lock.lock()
+        try:
+            self.window_pool.hide_all()
+        finally:
+            self.lock.unlock()
+
+    def showAllWindows_(self, _):
+        self.lock.lock()
+        try:
+            self.window_pool.show_all()
+        finally:
+            self.lock.unlock()
+
+    def windows_hidden(self):
+        return self.window_pool.hidden
+
+    def _clearAllWindows(self):
+        self.differ.clear()
+
+
+OverlayManager.showOverlays_ = selector(
+    OverlayManager.showOverlays_,
+    selector=b'showOverlays:',
+    signature=b'v@:@'
+)
+OverlayManager.hideAllWindows_ = selector(
+    OverlayManager.hideAllWindows_,
+    selector=b'hideAllWindows:',
+    signature=b'v@:@'
+)
+OverlayManager.showAllWindows_ = selector(
+    OverlayManager.showAllWindows_,
+    selector=b'showAllWindows:',
     signature=b'v@:@'
 )
 
+# 持续模式的截图频率（次/秒）：画面变化时升到 CAPTURE_MAX_RATE，空闲时逐步退到 CAPTURE_MIN_RATE；
+# 截图 + OCR 的 CPU 占比不超过 CAPTURE_CPU_BUDGET。OCR / 翻译 / 渲染在各自线程里并行
+CAPTURE_MIN_RATE = 0.2
+CAPTURE_MAX_RATE = 5.0
+CAPTURE_CPU_BUDGET = 0.5
+capture_scheduler = AdaptiveScheduler.from_rates(CAPTURE_MIN_RATE, CAPTURE_MAX_RATE, cpu_budget=CAPTURE_CPU_BUDGET)
+
+# 调试录制：开启后在内存里保留最近若干周期，command + control + d 导出。
+# 帧在后台压缩成 PNG 再入缓冲：原始 RGBA 全屏帧每张约 24 MB（3024x1964）到 59 MB（5K），
+# 压缩后通常 1~3 MB；缓冲总量再由 DEBUG_RECORD_MAX_BYTES 封顶
+DEBUG_RECORD = False
+DEBUG_RECORD_CAPACITY = 30
+DEBUG_RECORD_MAX_BYTES = 256 * 1024 * 1024
+debug_recorder = DebugRecorder(capacity=DEBUG_RECORD_CAPACITY, enabled=DEBUG_RECORD, max_bytes=DEBUG_RECORD_MAX_BYTES)
+
+# 指标：每隔 METRICS_LOG_INTERVAL 秒打印一行摘要；METRICS_PORT 不为 None 时在本地开放
+# http://127.0.0.1:<port>/metrics（Prometheus 文本）和 /metrics.json
+METRICS_LOG_INTERVAL = 60
+METRICS_PORT = None
+
 # sct = mss()  # 用于全屏截图
 def background_loop(manager):
-    global is_lock
-    while True:
+    warm_up_translation_engine()
+    if METRICS_LOG_INTERVAL:
+        metrics.start_reporter(METRICS_LOG_INTERVAL)
+    if METRICS_PORT is not None:
+        metrics.serve(METRICS_PORT)
+    metrics.register_gauge("capture_interval_seconds", capture_scheduler.next_interval)
+    incremental_ocr = IncrementalOcr()
+    block_tracker = BlockTracker()
+    # 最近一次截图耗时，和 OCR 耗时一起作为调度器的 CPU 开销
+    capture_cost = [0.0]
+
+    def capture_stage():
         if is_lock:
-            manager.hide_all_windows()
-            time.sleep(0.2)
-            continue
+            # AppKit 窗口只在主线程操作
+            if not manager.windows_hidden():
+                manager.performSelectorOnMainThread_withObject_waitUntilDone_('hideAllWindows:', None, True)
+            # 锁定时不轮询，等热键 wake()
+            capture_scheduler.wait()
+            return None
 
         if not manager.continuous_mode and not manager.toggle_display:
-            # manager.hide_all_windows()
-            time.sleep(0.2)
-            continue
+            capture_scheduler.wait()
+            return None
 
-        manager.hide_all_windows()
-        time.sleep(0.1)
+        if manager.continuous_mode:
+            capture_scheduler.sleep()
+            if is_lock:
+                return None
+
+        # 浮窗设置了 NSWindowSharingNone，截图里看不到它们，不必隐藏再显示
+        capture_scheduler.tick()
+        start = time.perf_counter()
+        with metrics.timer("capture"):
+            pil_img = capture_fullscreen()
+        capture_cost[0] = time.perf_counter() - start
+
+        # 如果是单次翻译模式，截一次图后重置 toggle
+        if not manager.continuous_mode:
+            manager.toggle_display = False
 
-        pil_img = capture_fullscreen()
         if pil_img is None:
-            continue
+            return None
+        return FrameJob(pil_img)
 
-        image_width, image_height = pil_img.size
+    def ocr_stage(job):
+        # 只对变化的 tile 重新 OCR；文字和位置都没变就不往下走，屏幕上的旧翻译仍然有效
+        start = time.perf_counter()
+        screen = NSScreen.mainScreen()
+        scale_x, scale_y = screen_scale(job.frame, int(screen.frame().size.width), int(screen.frame().size.height))
+        blocks, changed = incremental_ocr.get_text_blocks(job.frame, scale_x, scale_y)
+        if changed:
+            # 给块分配跨帧稳定的 id，沿用文字没变的块的译文
+            blocks = block_tracker.update([dict(b) for b in blocks])
+        unchanged = not changed or block_tracker.unchanged(blocks)
+        # 画面有变化就加快截图，连续不变则逐步放慢
+        capture_scheduler.record(not unchanged, capture_cost[0] + time.perf_counter() - start)
+        if unchanged:
+            # 解锁后画面与锁定前一致，之前隐藏的译文仍然有效，直接恢复；画面变了则等新结果渲染
+            if manager.windows_hidden() and not is_lock:
+                manager.performSelectorOnMainThread_withObject_waitUntilDone_('showAllWindows:', None, False)
+            metrics.inc("frames_skipped")
+            return None
+        metrics.inc("frames_processed")
+        metrics.observe("blocks_per_frame", len(blocks), COUNT_BUCKETS)
+        # 画面已经换了，更早还在翻译 / 渲染的帧作废
+        pipeline.supersede(job.frame_id)
+        job.blocks = blocks
+        return job
+
+    def translate_stage(job):
+        # 只翻译新出现或文字变了的块
+        pending = [b for b in job.blocks if b['translation'] is None]
+        results = translate_batch([b['text'] for b in pending]) if pending else []
+        for block, translation in zip(pending, results):
+            block['translation'] = translation
+            if translation not in (FAILED_TEXT, TIMEOUT_TEXT):
+                block_tracker.remember(block['id'], translation)
+        metrics.inc("blocks_reused", len(job.blocks) - len(pending))
+        job.translations = [b['translation'] for b in job.blocks]
+        return job
+
+    def render_stage(job):
+        if is_lock:
+            return None
         screen = NSScreen.mainScreen()
         screen_width = int(screen.frame().size.width)
         screen_height = int(screen.frame().size.height)
-        blocks = get_text_blocks(pil_img, screen_width=screen_width, screen_height=screen_height)
-        texts = [b['text'] for b in blocks]
-        if not texts:
-            time.sleep(0.5)
-            continue
-
-        translations = translate_batch(texts)
-        manager.performSelectorOnMainThread_withObject_waitUntilDone_(
-            'showTranslatedBlocks:translations:',
-            [blocks, translations, image_width, image_height],
-            True
-        )
-
-        # 如果是单次翻译模式，显示一次后重置 toggle
-        if not manager.continuous_mode:
-            manager.toggle_display = False
-
-        time.sleep(3)
+        for i, (block, translation) in enumerate(zip(job.blocks, job.translations)):
+            print(f"[{i}] 坐标: ({block['left']:.1f}, {block['top']:.1f}) 原文: {block['text']} 翻译: {translation}")
+        # 字号和位置在渲染线程算好，主线程只负责摆放窗口
+        with metrics.timer("layout"):
+            overlays = layout_frame(job.blocks, job.translations, screen_width, screen_height)
+        with metrics.timer("render"):
+            manager.performSelectorOnMainThread_withObject_waitUntilDone_(
+                'showOverlays:',
+                overlays,
+                True
+            )
+        debug_recorder.record(job.frame, job.blocks, job.translations)
+        return job
+
+    pipeline = StagedPipeline(capture_stage, [
+        ("ocr", ocr_stage),
+        ("translate", translate_stage),
+        ("render", render_stage),
+    ])
+    pipeline.start()
+    return pipeline
+
+screen_source = QuartzFrameSource()
 
 def capture_fullscreen():
-    from Quartz import (
-        CGWindowListCreateImage,
-        kCGWindowListOptionOnScreenOnly,
-        kCGNullWindowID,
-        kCGWindowImageDefault,
-        CGRectMake
-    )
-    from AppKit import NSImage, NSBitmapImageRep
-    from PIL import Image
-
-    screen = NSScreen.mainScreen()
-    screen_width = int(screen.frame().size.width)
-    screen_height = int(screen.frame().size.height)
-
-    rect = CGRectMake(0, 0, screen_width, screen_height)
-    cg_image = CGWindowListCreateImage(
-        rect,
-        kCGWindowListOptionOnScreenOnly,
-        kCGNullWindowID,
-        kCGWindowImageDefault
-    )
-
-    # 将 CGImage 转换为 NSImage
-    ns_image = NSImage.alloc().initWithCGImage_size_(cg_image, (screen_width, screen_height))
-    bitmap_rep = NSBitmapImageRep.imageRepWithData_(ns_image.TIFFRepresentation())
-    if bitmap_rep is None:
-        print("无法从 NSImage 中获取位图表示")
-        return None
-
-    width = bitmap_rep.pixelsWide()
-    height = bitmap_rep.pixelsHigh()
-    raw_data = bitmap_rep.bitmapData()
-    pil_img = Image.frombuffer("RGBA", (width, height), raw_data, "raw", "RGBA", 0, 1)
-    pil_img.save("debug_frame.png")
-    return pil_img
+    return screen_source.read()
 
 def global_key_listener(manager):
     """
     使用 Quartz 创建 CGEventTap 监听全局键盘事件。
-    现在需要同时按下 command + control，再按 y 或 h 才触发行为。
+    现在需要同时按下 command + control，再按 y 或 h 才触发行为；
+    按 d 导出调试录制缓冲（需开启 DEBUG_RECORD）。
     """
     import Quartz
     import ctypes
@@ -305,6 +343,10 @@ def global_key_listener(manager):
                     # manager.continuous_mode = not manager.continuous_mode
                     is_lock = True
                     print("切换持续翻译模式，当前状态：", manager.continuous_mode)
+                elif keycode == 2:  # d
+                    debug_recorder.dump()
+                # 状态变了，唤醒等待中的截图线程
+                capture_scheduler.wake()
         return event
 
     # 设置事件掩码为键盘事件
@@ -0,0 +1,190 @@
+import json
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Histogram:
+    """固定桶直方图（给 Prometheus）+ 最近样本窗口（算 p50/p95/p99）。"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS, window=2048):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.recent.append(value)
+
+    def quantile(self, q):
+        if not self.recent:
+            return 0.0
+        # nearest-rank：不小于 q 比例样本的最小值，两个样本时 p50 取较小者
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'max': max(self.recent) if self.recent else 0.0,
+        }
+
+
+class Metrics:
+    """
+    轻量指标：timer() 记录各阶段耗时直方图，inc() 计数，gauge 可注册为回调。
+    支持周期性摘要日志和本地 HTTP 导出（/metrics 为 Prometheus 文本，/metrics.json 为 JSON）。
+    """
+
+    def __init__(self, prefix="realtisst"):
+        self.prefix = prefix
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name, buckets=LATENCY_BUCKETS):
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = Histogram(buckets)
+            return hist
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS):
+        hist = self.histogram(name, buckets)
+        with self._lock:
+            hist.observe(value)
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage + "_seconds", time.perf_counter() - start)
+
+    def inc(self, name, amount=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def set_gauge(self, name, value):
+        with self._lock:
+            self._gauges[name] = value
+
+    def register_gauge(self, name, fn):
+        # fn 在导出时才调用，适合缓存命中数这类由别的模块维护的值
+        with self._lock:
+            self._gauges[name] = fn
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        with self._lock:
+            histograms = {name: hist.snapshot() for name, hist in self._histograms.items()}
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+        values = {}
+        for name, value in gauges.items():
+            try:
+                values[name] = value() if callable(value) else value
+            except Exception:
+                continue
+        return {'histograms': histograms, 'counters': counters, 'gauges': values}
+
+    def summary_line(self):
+        snap = self.snapshot()
+        parts = []
+        for name, hist in sorted(snap['histograms'].items()):
+            if name.endswith("_seconds"):
+                parts.append(f"{name[:-8]} p50={hist['p50'] * 1000:.0f}ms p95={hist['p95'] * 1000:.0f}ms")
+            else:
+                parts.append(f"{name} avg={hist['mean']:.1f}")
+        parts.extend(f"{name}={value}" for name, value in sorted(snap['counters'].items()))
+        parts.extend(f"{name}={value:.3g}" if isinstance(value, float) else f"{name}={value}"
+                     for name, value in sorted(snap['gauges'].items()))
+        return " | ".join(parts)
+
+    def prometheus_text(self):
+        lines = []
+        with self._lock:
+            histograms = [(name, hist.buckets, list(hist.counts), hist.sum, hist.count)
+                          for name, hist in self._histograms.items()]
+        for name, buckets, counts, total, count in sorted(histograms):
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, n in zip(buckets, counts):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {count}')
+            lines.append(f"{metric}_sum {total}")
+            lines.append(f"{metric}_count {count}")
+        snap = self.snapshot()
+        for name, value in sorted(snap['counters'].items()):
+            lines.append(f"# TYPE {self.prefix}_{name}_total counter")
+            lines.append(f"{self.prefix}_{name}_total {value}")
+        for name, value in sorted(snap['gauges'].items()):
+            if isinstance(value, (int, float)):
+                lines.append(f"# TYPE {self.prefix}_{name} gauge")
+                lines.append(f"{self.prefix}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def start_reporter(self, interval=60.0):
+        def report():
+            while True:
+                time.sleep(interval)
+                print("[metrics]", self.summary_line())
+
+        thread = threading.Thread(target=report, name="metrics-reporter", daemon=True)
+        thread.start()
+        return thread
+
+    def serve(self, port=9108, host="127.0.0.1"):
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = metrics.prometheus_text().encode()
+                    content_type = "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body = json.dumps(metrics.snapshot(), ensure_ascii=False).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        return server
+
+
+# 进程内共享的指标实例
+metrics = Metrics()
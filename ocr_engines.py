@@ -0,0 +1,108 @@
+import threading
+
+import pytesseract
+
+
+class OcrEngine:
+    """
+    OCR 引擎接口：image_to_words(img) 返回置信度达标的单词列表，
+    每个单词含 text / left / top / width / height（img 自身坐标）。
+    """
+    name = "base"
+
+    def __init__(self, lang='eng', min_conf=60):
+        self.lang = lang
+        self.min_conf = min_conf
+
+    def image_to_words(self, img):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PytesseractOcrEngine(OcrEngine):
+    """每次调用都起一个 tesseract 子进程（原来的实现），作为兜底。"""
+    name = "pytesseract"
+
+    def image_to_words(self, img):
+        data = pytesseract.image_to_data(img, lang=self.lang, output_type=pytesseract.Output.DICT)
+        words = []
+        for i in range(len(data['text'])):
+            text = data['text'][i].strip()
+            if text != "" and int(data['conf'][i]) > self.min_conf:
+                words.append({
+                    'text': text,
+                    'left': data['left'][i],
+                    'top': data['top'][i],
+                    'width': data['width'][i],
+                    'height': data['height'][i]
+                })
+        return words
+
+
+class TesserocrOcrEngine(OcrEngine):
+    """
+    常驻 Tesseract API：语言数据只加载一次，像素缓冲直接交给 SetImageBytes，
+    不写临时文件、不起子进程。TessBaseAPI 不是线程安全的，调用串行化。
+    """
+    name = "tesserocr"
+
+    _BYTES_PER_PIXEL = {'L': 1, 'RGB': 3, 'RGBA': 4}
+
+    def __init__(self, lang='eng', min_conf=60):
+        super().__init__(lang, min_conf)
+        import tesserocr
+
+        self._tesserocr = tesserocr
+        self._api = tesserocr.PyTessBaseAPI(lang=lang)
+        self._lock = threading.Lock()
+
+    def image_to_words(self, img):
+        tesserocr = self._tesserocr
+        if img.mode not in self._BYTES_PER_PIXEL:
+            img = img.convert('RGB')
+        bpp = self._BYTES_PER_PIXEL[img.mode]
+        width, height = img.size
+
+        words = []
+        with self._lock:
+            self._api.SetImageBytes(img.tobytes(), width, height, bpp, width * bpp)
+            self._api.Recognize()
+            level = tesserocr.RIL.WORD
+            iterator = self._api.GetIterator()
+            for word in tesserocr.iterate_level(iterator, level):
+                text = (word.GetUTF8Text(level) or "").strip()
+                if text == "" or word.Confidence(level) <= self.min_conf:
+                    continue
+                bbox = word.BoundingBox(level)
+                if bbox is None:
+                    continue
+                x1, y1, x2, y2 = bbox
+                words.append({
+                    'text': text,
+                    'left': x1,
+                    'top': y1,
+                    'width': x2 - x1,
+                    'height': y2 - y1
+                })
+            self._api.Clear()
+        return words
+
+    def close(self):
+        with self._lock:
+            self._api.End()
+
+
+def create_ocr_engine(kind='auto', lang='eng'):
+    # auto：装了 tesserocr 就用常驻引擎，否则退回 pytesseract
+    if kind in ('auto', 'tesserocr'):
+        try:
+            return TesserocrOcrEngine(lang=lang)
+        except Exception as e:
+            if kind == 'tesserocr':
+                raise
+            print("tesserocr 不可用，改用 pytesseract：", e)
+    if kind in ('auto', 'pytesseract'):
+        return PytesseractOcrEngine(lang=lang)
+    raise ValueError(f"未知 OCR 引擎：{kind}")
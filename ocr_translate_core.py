@@ -1,126 +1,262 @@
-import pytesseract
-import requests
+from layout_grouping import group_words_into_blocks
+from metrics import metrics
+from ocr_engines import create_ocr_engine
+from preprocess import OcrPreprocessor
+from translation_cache import TranslationCache
+from translation_engines import create_translation_engine
+from translation_memory import TranslationMemory
 
 # 设置语言（只保留你需要识别的语言）
 OCR_LANG = 'eng'
+# OCR 引擎："auto" 优先常驻的 tesserocr（需另行 pip install tesserocr），没有安装时退回 pytesseract 子进程
+OCR_ENGINE = 'auto'
+# 并行条带 OCR 的进程数，0 或 1 表示关闭（单进程整帧识别）
+OCR_WORKERS = 0
+OCR_STRIP_OVERLAP = 64
+# OCR 前处理：灰度 + 按文字高度自适应缩小（目标字高，像素），可选对比度拉伸 / 二值化。
+# 会以一定召回率换速度，默认关闭；先用 bench_preprocess.py 在自己的截图上量好召回率和加速比再开启
+OCR_PREPROCESS = False
+OCR_TARGET_TEXT_HEIGHT = 32
+OCR_MIN_SCALE = 0.4
+OCR_NORMALIZE_CONTRAST = False
+OCR_BINARIZE = False
+# 文字区域检测：只 OCR 检测出的候选区域；候选区域占整帧比例超过上限时退回整帧识别
+OCR_TEXT_DETECT = False
+OCR_TEXT_DETECT_MAX_COVERAGE = 0.6
 overlay_windows = []
 last_texts = []
 
+# 翻译服务配置
+TRANSLATE_URL = "http://127.0.0.1:5000/translate"
+TRANSLATE_SOURCE = "auto"
+TRANSLATE_TARGET = "zh"
+# 翻译引擎："http" 走 LibreTranslate 服务；"argos" 在本进程内加载 Argos 模型
+TRANSLATE_ENGINE = "http"
+
+# 翻译缓存配置：CACHE_DB_PATH 为 None 时只用内存缓存
+CACHE_MAX_SIZE = 5000
+CACHE_TTL = 24 * 3600
+CACHE_DB_PATH = None
+
+translation_cache = TranslationCache(max_size=CACHE_MAX_SIZE, ttl=CACHE_TTL, db_path=CACHE_DB_PATH)
+metrics.register_gauge("cache_hits", lambda: translation_cache.stats()['hits'])
+metrics.register_gauge("cache_misses", lambda: translation_cache.stats()['misses'])
+metrics.register_gauge("cache_evictions", lambda: translation_cache.stats()['evictions'])
+metrics.register_gauge("cache_hit_rate", lambda: translation_cache.stats()['hit_rate'])
+
+# 翻译记忆：精确缓存未命中时，按“数字 / URL / 标识符替换成占位符”后的模板查找并代回本次的值
+TM_ENABLED = True
+TM_MAX_SIZE = 200000
+TM_DB_PATH = None
+
+translation_memory = TranslationMemory(max_size=TM_MAX_SIZE, db_path=TM_DB_PATH)
+metrics.register_gauge("tm_hits", lambda: translation_memory.stats()['hits'])
+metrics.register_gauge("tm_hit_rate", lambda: translation_memory.stats()['hit_rate'])
+
+# 批量翻译分块：LibreTranslate 的 q 支持数组，一次请求翻译多条
+TRANSLATE_CHUNK_MAX_TEXTS = 32
+TRANSLATE_CHUNK_MAX_CHARS = 2000
+
+# 并发与超时：同时在途的请求数、单请求超时、整批截止时间（秒）
+TRANSLATE_MAX_IN_FLIGHT = 4
+TRANSLATE_REQUEST_TIMEOUT = 5.0
+TRANSLATE_BATCH_DEADLINE = 8.0
+
+_translation_engine = None
+
+def get_translation_engine():
+    global _translation_engine
+    if _translation_engine is None:
+        _translation_engine = create_translation_engine(
+            TRANSLATE_ENGINE,
+            url=TRANSLATE_URL,
+            source=TRANSLATE_SOURCE,
+            target=TRANSLATE_TARGET,
+            max_in_flight=TRANSLATE_MAX_IN_FLIGHT,
+            request_timeout=TRANSLATE_REQUEST_TIMEOUT,
+            batch_deadline=TRANSLATE_BATCH_DEADLINE,
+            chunk_max_texts=TRANSLATE_CHUNK_MAX_TEXTS,
+            chunk_max_chars=TRANSLATE_CHUNK_MAX_CHARS
+        )
+    return _translation_engine
+
+def set_translation_engine(engine):
+    global _translation_engine
+    if _translation_engine is not None and _translation_engine is not engine:
+        _translation_engine.close()
+    _translation_engine = engine
+
+def warm_up_translation_engine():
+    # 启动时预热（加载模型 / 建立连接），避免第一帧卡住
+    try:
+        get_translation_engine().warm_up()
+    except Exception as e:
+        print("翻译引擎预热失败：", e)
+
+# 批内去重统计：送进 translate_batch 的条数与去重后实际查询的条数
+_dedup_stats = {'texts': 0, 'unique': 0}
+metrics.register_gauge("translate_dedup_ratio", lambda: get_translation_dedup_stats()['dedup_ratio'])
+
+def normalize_query(text):
+    # 空白归一（OCR 的多余空格、换行），空文本统一为占位
+    return " ".join(text.split()) or "[空]"
+
 def translate_batch(text_list):
     if not text_list:
         return []
+    with metrics.timer("translate"):
+        # 同一帧里重复的菜单项、表头等只翻译一次，再按原顺序展开
+        queries = [normalize_query(text) for text in text_list]
+        unique = list(dict.fromkeys(queries))
+        _dedup_stats['texts'] += len(queries)
+        _dedup_stats['unique'] += len(unique)
+        metrics.inc("translate_texts", len(queries))
+        metrics.inc("translate_texts_unique", len(unique))
+        translated = dict(zip(unique, _translate_batch(unique)))
+        return [translated[query] for query in queries]
+
+def get_translation_dedup_stats():
+    texts, unique = _dedup_stats['texts'], _dedup_stats['unique']
+    return {
+        'texts': texts,
+        'unique': unique,
+        'dedup_ratio': 1 - unique / texts if texts else 0.0,
+    }
+
+def _translate_batch(queries):
+    # queries 已经归一化且互不重复
+    engine = get_translation_engine()
+    results = [None] * len(queries)
 
-    url = "http://127.0.0.1:5000/translate"
-    results = []
-    for text in text_list:
-        payload = {
-            "q": text if text.strip() else "[空]",
-            "source": "auto",
-            "target": "zh",
-            "format": "text"
-        }
-        try:
-            response = requests.post(url, data=payload)
-            result = response.json().get("translatedText", "")
-        except Exception as e:
-            print("翻译失败：", e)
-            result = "[翻译失败]"
-        results.append(result)
+    # 先查缓存，再查翻译记忆，只翻译都未命中的部分
+    missing = []
+    fresh = []
+    for i, query in enumerate(queries):
+        cached = translation_cache.get(query, TRANSLATE_SOURCE, TRANSLATE_TARGET, engine.name)
+        if cached is None and TM_ENABLED:
+            cached = translation_memory.lookup(query, TRANSLATE_SOURCE, TRANSLATE_TARGET, engine.name)
+            if cached is not None:
+                fresh.append((query, cached))
+        if cached is None:
+            missing.append(i)
+        else:
+            results[i] = cached
+
+    learned = []
+    translated = engine.translate([queries[i] for i in missing])
+    for i, (result, ok) in zip(missing, translated):
+        results[i] = result
+        # 失败结果不进缓存，下一轮会重试
+        if ok:
+            learned.append((queries[i], result))
+        else:
+            metrics.inc("translation_errors")
+    translation_cache.put_many(fresh + learned, TRANSLATE_SOURCE, TRANSLATE_TARGET, engine.name)
+    if TM_ENABLED:
+        translation_memory.learn_many(learned, TRANSLATE_SOURCE, TRANSLATE_TARGET, engine.name)
     return results
 
+def get_translation_cache_stats():
+    return translation_cache.stats()
+
+def get_translation_memory_stats():
+    return translation_memory.stats()
+
 # 获取 OCR 文本 + 位置信息
 
-def get_text_blocks(img, screen_width=None, screen_height=None):
-    import numpy as np
-    from sklearn.cluster import DBSCAN
-    image_width, image_height = img.size
+_ocr_engine = None
 
-    # macOS Quartz 截图为 Retina 2x 分辨率，坐标需缩放 0.5
-    scale_x = 0.5
-    scale_y = 0.5
+def get_ocr_engine():
+    # 每个进程一个常驻引擎（并行 OCR 的工作进程也各自持有一个）
+    global _ocr_engine
+    if _ocr_engine is None:
+        _ocr_engine = create_ocr_engine(OCR_ENGINE, lang=OCR_LANG)
+    return _ocr_engine
 
-    data = pytesseract.image_to_data(img, lang=OCR_LANG, output_type=pytesseract.Output.DICT)
-    words = []
+_preprocessor = None
 
-    for i in range(len(data['text'])):
-        text = data['text'][i].strip()
-        if text != "" and int(data['conf'][i]) > 60:
-            words.append({
-                'text': text,
-                'left': data['left'][i],
-                'top': data['top'][i],
-                'width': data['width'][i],
-                'height': data['height'][i],
-                'right': data['left'][i] + data['width'][i],
-                'bottom': data['top'][i] + data['height'][i]
-            })
-
-    if not words:
-        return []
+def get_preprocessor():
+    global _preprocessor
+    if _preprocessor is None:
+        _preprocessor = OcrPreprocessor(
+            target_text_height=OCR_TARGET_TEXT_HEIGHT,
+            min_scale=OCR_MIN_SCALE,
+            normalize_contrast=OCR_NORMALIZE_CONTRAST,
+            binarize=OCR_BINARIZE
+        )
+    return _preprocessor
 
-    # Step 1: Y方向聚类（文本行）
-    avg_height = np.mean([w['height'] for w in words]) or 1.0
-    y_points = np.array([
-        [0, (w['top'] + w['height'] / 2) / avg_height]
-        for w in words
-    ])
-    line_clustering = DBSCAN(eps=1.0, min_samples=1).fit(y_points)
-    line_labels = line_clustering.labels_
-
-    from collections import defaultdict
-    lines_dict = defaultdict(list)
-    for word, label in zip(words, line_labels):
-        lines_dict[label].append(word)
-
-    # Step 2: 行内按 X 方向聚合段落
-    paragraphs = []
-    for line in lines_dict.values():
-        line.sort(key=lambda w: w['left'])
-        current_para = [line[0]]
-        for i in range(1, len(line)):
-            prev = current_para[-1]
-            curr = line[i]
-            gap = curr['left'] - prev['right']
-            avg_width = np.mean([w['width'] for w in line]) or 1.0
-            if gap > avg_width * 1.5:
-                paragraphs.append(current_para)
-                current_para = [curr]
-            else:
-                current_para.append(curr)
-        if current_para:
-            paragraphs.append(current_para)
-
-    results = []
-    for group in paragraphs:
-        if not group:
-            continue
-
-        # 把这段的坐标和内容一起保存（先不排序）
-        full_text = " ".join([w['text'] for w in group])
-        # 使用第一个词作为 anchor 显示点
-        anchor = group[0]
-        left = anchor['left']
-        top = anchor['top']
-        right = max(w['right'] for w in group)
-        bottom = max(w['bottom'] for w in group)
-
-        results.append({
-            'text': full_text,
-            'left': left * scale_x,
-            'top': top * scale_y,
-            'width': (right - left) * scale_x,
-            'height': (bottom - top) * scale_y,
-            'original_top': top
+def ocr_words(img, offset_x=0, offset_y=0, scale=None):
+    # 识别 img 中的单词，坐标加上 offset 换算到整帧坐标系（用于裁剪区域 OCR）
+    # scale 为前处理的缩放比例，不传时按当前估计的文字高度决定
+    if OCR_PREPROCESS:
+        img, scale = get_preprocessor().process(img, scale)
+    else:
+        scale = 1.0
+    words = []
+    for w in get_ocr_engine().image_to_words(img):
+        # 缩小后的坐标映射回原图
+        left = int(round(w['left'] / scale)) + offset_x
+        top = int(round(w['top'] / scale)) + offset_y
+        width = int(round(w['width'] / scale))
+        height = int(round(w['height'] / scale))
+        words.append({
+            'text': w['text'],
+            'left': left,
+            'top': top,
+            'width': width,
+            'height': height,
+            'right': left + width,
+            'bottom': top + height
         })
+    return words
 
-    # ✅ 按原始 top 排序（再也不会丢失映射）
-    results.sort(key=lambda b: b['original_top'])
+_parallel_ocr = None
 
-    # ✅ 最后删除辅助字段
-    for b in results:
-        del b['original_top']
+def ocr_frame_words(img):
+    # 整帧识别：开启 OCR_TEXT_DETECT 时只识别候选文字区域；开启 OCR_WORKERS 时走常驻进程池的并行条带 OCR
+    global _parallel_ocr
+    scale = get_preprocessor().current_scale() if OCR_PREPROCESS else None
+    regions = None
+    if OCR_TEXT_DETECT:
+        from text_detect import detect_text_regions, region_coverage
+        with metrics.timer("text_detect"):
+            regions = detect_text_regions(img)
+        if region_coverage(regions, img.size) > OCR_TEXT_DETECT_MAX_COVERAGE:
+            regions = None
 
-    return results
+    if regions is not None:
+        # 各区域分别识别；区域之间可能有少量重叠，单词按中心点归属去重
+        from text_detect import assign_region_words
+        region_words = [ocr_words(img.crop((left, top, right, bottom)), offset_x=left, offset_y=top, scale=scale)
+                        for left, top, right, bottom in regions]
+        words = assign_region_words(regions, region_words)
+    elif OCR_WORKERS and OCR_WORKERS > 1:
+        if _parallel_ocr is None:
+            from parallel_ocr import ParallelOcr
+            _parallel_ocr = ParallelOcr(workers=OCR_WORKERS, overlap=OCR_STRIP_OVERLAP)
+        words = _parallel_ocr.ocr_words(img, scale)
+    else:
+        words = ocr_words(img, scale=scale)
+    # 用整帧结果更新文字高度估计，决定下一帧的缩放比例
+    if OCR_PREPROCESS:
+        get_preprocessor().observe_words(words)
+    return words
+
+def screen_scale(img, screen_width=None, screen_height=None):
+    # 图像像素 -> 屏幕坐标的比例；不知道屏幕尺寸时按 macOS Retina 2x 截图处理（0.5）
+    image_width, image_height = img.size
+    scale_x = screen_width / image_width if screen_width else 0.5
+    scale_y = screen_height / image_height if screen_height else scale_x
+    return scale_x, scale_y
+
+def get_text_blocks(img, screen_width=None, screen_height=None):
+    scale_x, scale_y = screen_scale(img, screen_width, screen_height)
+
+    with metrics.timer("ocr"):
+        words = ocr_frame_words(img)
+    with metrics.timer("grouping"):
+        return group_words_into_blocks(words, scale_x, scale_y)
 
 # 本地翻译 API 示例（替换为你自己的）
 # def translate_ocr(text):
@@ -0,0 +1,54 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from ocr_translate_core import ocr_words
+
+
+def split_strips(height, count, overlap):
+    """
+    把高度切成 count 条水平条带，返回 [(top, bottom, own_top, own_bottom), ...]。
+    [own_top, own_bottom) 是条带“负责”的范围，上下各外扩 overlap 像素用于完整识别跨界单词。
+    """
+    count = max(1, min(count, height))
+    step = height / count
+    strips = []
+    for i in range(count):
+        own_top = int(round(i * step))
+        own_bottom = int(round((i + 1) * step)) if i < count - 1 else height
+        strips.append((max(0, own_top - overlap), min(height, own_bottom + overlap), own_top, own_bottom))
+    return strips
+
+
+def _ocr_strip(args):
+    img, top, scale = args
+    return ocr_words(img, offset_y=top, scale=scale)
+
+
+class ParallelOcr:
+    """
+    并行条带 OCR：整帧切成带重叠的水平条带，在常驻进程池里并行跑 Tesseract，
+    每个单词只归属中心点所在的条带，去掉跨界重复。
+    """
+
+    def __init__(self, workers=None, strips=None, overlap=64):
+        self.workers = workers or os.cpu_count() or 1
+        self.strips = strips or self.workers
+        self.overlap = overlap
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def ocr_words(self, img, scale=None):
+        # scale 由主进程决定后传给各工作进程，保证所有条带缩放一致
+        image_width, image_height = img.size
+        strips = split_strips(image_height, self.strips, self.overlap)
+        jobs = [(img.crop((0, top, image_width, bottom)), top, scale) for top, bottom, _, _ in strips]
+
+        words = []
+        for (_, _, own_top, own_bottom), strip_words in zip(strips, self._executor.map(_ocr_strip, jobs)):
+            for w in strip_words:
+                center_y = w['top'] + w['height'] / 2
+                if own_top <= center_y < own_bottom:
+                    words.append(w)
+        return words
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,120 @@
+import itertools
+import threading
+import time
+from collections import deque
+
+
+class LatestQueue:
+    """有界队列，满了就丢最旧的一项（latest-wins）。maxsize=1 时只保留最新一项。"""
+
+    def __init__(self, maxsize=1):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        # 队列关闭或超时返回 None
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class FrameJob:
+    _ids = itertools.count(1)
+
+    def __init__(self, frame):
+        self.frame_id = next(FrameJob._ids)
+        self.frame = frame
+        self.blocks = None
+        self.translations = None
+        self.captured_at = time.monotonic()
+
+
+class StagedPipeline:
+    """
+    分阶段流水线：source 在自己的线程里产出 FrameJob，之后每个 stage 各占一个工作线程，
+    阶段之间用 LatestQueue 连接，吞吐只受最慢阶段限制。
+    stage 函数返回 None 表示丢弃该帧；调用 supersede(frame_id) 后，
+    更早的帧在之后任何阶段都会被直接丢弃，不会渲染已经不存在的画面。
+    """
+
+    def __init__(self, source, stages, queue_size=1):
+        self.source = source
+        self.stages = stages
+        self.queues = [LatestQueue(queue_size) for _ in stages]
+        self._stale_before = 0
+        self._stale_lock = threading.Lock()
+        self._running = threading.Event()
+        self._threads = []
+        self.dropped_stale = 0
+
+    def supersede(self, frame_id):
+        with self._stale_lock:
+            self._stale_before = max(self._stale_before, frame_id)
+
+    def is_stale(self, job):
+        return job.frame_id < self._stale_before
+
+    def start(self):
+        self._running.set()
+        self._threads = [threading.Thread(target=self._source_loop, name="pipeline-source", daemon=True)]
+        for i, (name, _) in enumerate(self.stages):
+            self._threads.append(threading.Thread(target=self._stage_loop, args=(i,), name=f"pipeline-{name}", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._running.clear()
+        for queue in self.queues:
+            queue.close()
+
+    def _source_loop(self):
+        while self._running.is_set():
+            try:
+                job = self.source()
+            except Exception as e:
+                print("采集阶段出错：", e)
+                time.sleep(0.5)
+                continue
+            if job is not None:
+                self.queues[0].put(job)
+
+    def _stage_loop(self, index):
+        name, fn = self.stages[index]
+        inbox = self.queues[index]
+        outbox = self.queues[index + 1] if index + 1 < len(self.queues) else None
+        while self._running.is_set():
+            job = inbox.get(timeout=0.5)
+            if job is None:
+                continue
+            if self.is_stale(job):
+                self.dropped_stale += 1
+                continue
+            try:
+                job = fn(job)
+            except Exception as e:
+                print(f"{name} 阶段出错：", e)
+                continue
+            if job is None:
+                continue
+            if outbox is not None:
+                if self.is_stale(job):
+                    self.dropped_stale += 1
+                    continue
+                outbox.put(job)
@@ -0,0 +1,89 @@
+from collections import defaultdict
+
+
+def rects_overlap(a, b):
+    x1, y1, w1, h1 = a
+    x2, y2, w2, h2 = b
+    return x1 < x2 + w2 and x1 + w1 > x2 and y1 < y2 + h2 and y1 + h1 > y2
+
+
+class SpatialGrid:
+    """
+    均匀网格空间索引：矩形 (x, y, w, h) 登记到它覆盖的每个 cell，
+    查询时只检查目标矩形覆盖的 cell 里的矩形，浮窗数量多时也接近常数时间。
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        self.rects = []
+
+    def _cells(self, rect):
+        x, y, w, h = rect
+        size = self.cell_size
+        # 右 / 下边界是开区间，刚好贴边的矩形不算进下一个 cell
+        col0, col1 = int(x // size), int((x + max(w, 1) - 1e-9) // size)
+        row0, row1 = int(y // size), int((y + max(h, 1) - 1e-9) // size)
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                yield row, col
+
+    def insert(self, rect):
+        index = len(self.rects)
+        self.rects.append(rect)
+        for cell in self._cells(rect):
+            self.cells[cell].append(index)
+        return index
+
+    def query(self, rect):
+        """返回与 rect 相交的已登记矩形。"""
+        seen = set()
+        hits = []
+        for cell in self._cells(rect):
+            for index in self.cells.get(cell, ()):
+                if index in seen:
+                    continue
+                seen.add(index)
+                other = self.rects[index]
+                if rects_overlap(rect, other):
+                    hits.append(other)
+        return hits
+
+    def clear(self):
+        self.cells.clear()
+        self.rects = []
+
+    def __len__(self):
+        return len(self.rects)
+
+
+class OverlayPlacer:
+    """
+    浮窗摆放：坐标系 y 轴向下（屏幕像素，左上角为原点）。
+    与已摆放的浮窗重叠时直接下移到挡住它的浮窗下沿，直到不重叠或超出屏幕，
+    最后限制在屏幕内。每帧开始前调用 reset()。
+    """
+
+    def __init__(self, screen_width, screen_height, cell_size=64, margin=10, max_moves=50):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.margin = margin
+        self.max_moves = max_moves
+        self.grid = SpatialGrid(cell_size)
+
+    def place(self, x, y, width, height):
+        for _ in range(self.max_moves):
+            hits = self.grid.query((x, y, width, height))
+            if not hits:
+                break
+            y = max(hy + hh for _, hy, _, hh in hits)
+            if y > self.screen_height - height:
+                break
+
+        x = min(max(0, x), self.screen_width - width - self.margin)
+        y = min(max(0, y), self.screen_height - height - self.margin)
+        self.grid.insert((x, y, width, height))
+        return x, y
+
+    def reset(self):
+        self.grid.clear()
@@ -0,0 +1,87 @@
+import numpy as np
+from PIL import Image
+
+
+def otsu_threshold(gray):
+    # 基于 256 级直方图的 Otsu 阈值，全部向量化
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    total = hist.sum()
+    if total == 0:
+        return 128
+    levels = np.arange(256)
+    weight_bg = np.cumsum(hist)
+    weight_fg = total - weight_bg
+    mean_bg = np.cumsum(hist * levels)
+    mean_all = mean_bg[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between = (mean_all * weight_bg / total - mean_bg) ** 2 / (weight_bg * weight_fg)
+    between = np.nan_to_num(between)
+    return int(np.argmax(between))
+
+
+def contrast_lut(gray, low_pct=1.0, high_pct=99.0):
+    # 按百分位拉伸对比度，返回 256 项查找表
+    hist = np.bincount(gray.ravel(), minlength=256)
+    cdf = np.cumsum(hist) / max(1, gray.size)
+    low = int(np.searchsorted(cdf, low_pct / 100.0))
+    high = int(np.searchsorted(cdf, high_pct / 100.0))
+    if high <= low:
+        return np.arange(256, dtype=np.uint8)
+    levels = (np.arange(256) - low) * (255.0 / (high - low))
+    return np.clip(levels, 0, 255).astype(np.uint8)
+
+
+class OcrPreprocessor:
+    """
+    OCR 前处理：灰度化、按检测到的文字高度自适应缩小、可选对比度拉伸 / 二值化。
+    process() 返回 (处理后的图, 缩放比例)，OCR 坐标除以缩放比例即回到原图坐标。
+    文字高度取上一帧 OCR 结果中单词高度的中位数（observe_words 反馈）。
+    """
+
+    def __init__(self, grayscale=True, target_text_height=32, min_scale=0.4, max_scale=1.0,
+                 scale_step=0.05, normalize_contrast=False, binarize=False):
+        self.grayscale = grayscale
+        self.target_text_height = target_text_height
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.scale_step = scale_step
+        self.normalize_contrast = normalize_contrast
+        self.binarize = binarize
+        self.text_height = None
+
+    def current_scale(self):
+        if not self.target_text_height or not self.text_height:
+            return self.max_scale
+        scale = self.target_text_height / self.text_height
+        # 量化缩放比例，避免每帧细微变化导致 OCR 结果抖动
+        if self.scale_step:
+            scale = round(scale / self.scale_step) * self.scale_step
+        return float(min(self.max_scale, max(self.min_scale, scale)))
+
+    def observe_words(self, words):
+        # words 为原图坐标；只用有一定数量的样本更新，防止零星误识别把比例带偏
+        if len(words) < 5:
+            return
+        self.text_height = float(np.median([w['height'] for w in words]))
+
+    def process(self, img, scale=None):
+        if scale is None:
+            scale = self.current_scale()
+        if self.grayscale or self.normalize_contrast or self.binarize:
+            img = img.convert("L")
+        elif img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+
+        if scale < 1.0:
+            width, height = img.size
+            size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+            img = img.resize(size, Image.BOX)
+
+        if img.mode == "L" and (self.normalize_contrast or self.binarize):
+            gray = np.asarray(img)
+            if self.normalize_contrast:
+                gray = contrast_lut(gray)[gray]
+            if self.binarize:
+                gray = np.where(gray > otsu_threshold(gray), 255, 0).astype(np.uint8)
+            img = Image.fromarray(gray, "L")
+        return img, scale
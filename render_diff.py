@@ -0,0 +1,116 @@
+ADD = 'add'
+MOVE = 'move'
+UPDATE = 'update'
+REMOVE = 'remove'
+
+
+def make_overlay(key, x, y, width, height, text, font_size=None):
+    return {
+        'id': key,
+        'x': x,
+        'y': y,
+        'width': width,
+        'height': height,
+        'text': text,
+        'font_size': font_size
+    }
+
+
+def diff_overlays(previous, overlays):
+    """
+    对比上一帧和这一帧的浮窗，返回 [(op, key, overlay), ...]：
+      add     新出现的浮窗
+      move    文字和大小没变，只有位置变了
+      update  文字、字号或大小变了（窗口可以复用，只改内容和尺寸）
+      remove  这一帧里已经没有的浮窗（overlay 为旧值）
+    previous 为 {key: overlay}；overlays 按显示顺序排列，key 重复时只取第一个。
+    remove 排在最前面，让腾出的窗口能被同一帧的 add 复用。
+    """
+    keys = set(overlay['id'] for overlay in overlays)
+    ops = [(REMOVE, key, old) for key, old in previous.items() if key not in keys]
+    seen = set()
+    for overlay in overlays:
+        key = overlay['id']
+        if key in seen:
+            continue
+        seen.add(key)
+        old = previous.get(key)
+        if old is None:
+            ops.append((ADD, key, overlay))
+        elif (old['text'] != overlay['text'] or old['font_size'] != overlay['font_size'] or
+              old['width'] != overlay['width'] or old['height'] != overlay['height']):
+            ops.append((UPDATE, key, overlay))
+        elif old['x'] != overlay['x'] or old['y'] != overlay['y']:
+            ops.append((MOVE, key, overlay))
+    return ops
+
+
+class RenderDiffer:
+    """
+    平台无关的渲染差分：记住当前显示的浮窗，每帧只把变化的部分交给 renderer。
+    renderer 需实现 add(key, overlay)、move(key, overlay)、update(key, overlay)、remove(key)。
+    """
+
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.current = {}
+        self.counts = {ADD: 0, MOVE: 0, UPDATE: 0, REMOVE: 0, 'unchanged': 0}
+
+    def render(self, overlays):
+        ops = diff_overlays(self.current, overlays)
+        for op, key, overlay in ops:
+            if op == REMOVE:
+                self.renderer.remove(key)
+            else:
+                getattr(self.renderer, op)(key, overlay)
+            self.counts[op] += 1
+
+        current = {}
+        for overlay in overlays:
+            current.setdefault(overlay['id'], overlay)
+        self.counts['unchanged'] += len(current) - sum(1 for op, _, _ in ops if op != REMOVE)
+        self.current = current
+        return ops
+
+    def clear(self):
+        return self.render([])
+
+
+class FakeRenderer:
+    """
+    不依赖 AppKit 的 renderer，和 macV2 的 OverlayWindowPool 一样把移除的“窗口”放回空闲池、add 时优先复用；
+    记录收到的操作和当前“屏幕”上的浮窗，便于无界面调试和压测。
+    """
+
+    def __init__(self, max_idle=32):
+        self.windows = {}
+        self.idle = []
+        self.max_idle = max_idle
+        self.log = []
+        self.created = 0
+        self.reused = 0
+
+    def add(self, key, overlay):
+        if self.idle:
+            window = self.idle.pop()
+            self.reused += 1
+        else:
+            self.created += 1
+            window = {'handle': self.created}
+        window.update(overlay)
+        self.windows[key] = window
+        self.log.append((ADD, key))
+
+    def move(self, key, overlay):
+        self.windows[key].update(x=overlay['x'], y=overlay['y'])
+        self.log.append((MOVE, key))
+
+    def update(self, key, overlay):
+        self.windows[key].update(overlay)
+        self.log.append((UPDATE, key))
+
+    def remove(self, key):
+        window = self.windows.pop(key)
+        if len(self.idle) < self.max_idle:
+            self.idle.append(window)
+        self.log.append((REMOVE, key))
@@ -0,0 +1,56 @@
+import argparse
+import time
+
+from frame_source import open_frame_source
+from ocr_translate_core import get_text_blocks, translate_batch
+
+# 不填 --path 时各来源的默认值
+DEFAULT_PATHS = {'dir': "debug_frame.png", 'camera': "0"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="不依赖 AppKit，直接用帧来源驱动 OCR + 翻译（压测 / profiling 用）")
+    parser.add_argument("--source", choices=["mss", "quartz", "dir", "video", "camera"], default="dir")
+    parser.add_argument("--path", default=None,
+                        help="图片目录 / 图片文件 / 视频文件 / 摄像头编号（dir 默认 debug_frame.png，camera 默认 0）")
+    parser.add_argument("--rate", type=float, default=None, help="每秒帧数，不填则尽快处理")
+    parser.add_argument("--frames", type=int, default=None, help="最多处理多少帧")
+    parser.add_argument("--loop", action="store_true", help="图片目录 / 视频播完后从头循环")
+    parser.add_argument("--no-translate", action="store_true")
+    args = parser.parse_args()
+
+    path = args.path
+    if path is None:
+        path = DEFAULT_PATHS.get(args.source)
+    elif args.source == 'camera' and not path.isdigit():
+        parser.error(f"--source camera 的 --path 应为摄像头编号：{path}")
+    if path is None and args.source in ('dir', 'video'):
+        parser.error(f"--source {args.source} 需要 --path")
+
+    source = open_frame_source(args.source, path, loop=args.loop)
+    total_start = time.perf_counter()
+    count = 0
+    with source:
+        for frame in source.frames(rate=args.rate, limit=args.frames):
+            start = time.perf_counter()
+            blocks = get_text_blocks(frame)
+            ocr_time = time.perf_counter() - start
+
+            translations = []
+            if not args.no_translate:
+                translations = translate_batch([b['text'] for b in blocks])
+            translate_time = time.perf_counter() - start - ocr_time
+
+            count += 1
+            print(f"[{count}] {frame.size[0]}x{frame.size[1]} 文本块 {len(blocks)}"
+                  f"  OCR {ocr_time * 1000:.0f} ms  翻译 {translate_time * 1000:.0f} ms")
+            for block, translation in zip(blocks, translations):
+                print(f"    {block['text']} -> {translation}")
+
+    elapsed = time.perf_counter() - total_start
+    if count:
+        print(f"共 {count} 帧，{elapsed:.2f}s，{count / elapsed:.2f} fps")
+
+
+if __name__ == "__main__":
+    main()
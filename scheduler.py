@@ -0,0 +1,75 @@
+import threading
+import time
+
+
+class AdaptiveScheduler:
+    """
+    自适应截图节奏：内容变化时回到最快频率（突发），空闲时间隔按 backoff 指数拉长到最慢频率；
+    同时按实测的处理耗时限制 CPU 占比，处理耗时 / (耗时 + 等待) 不超过 cpu_budget。
+    wait() 可以被 wake() 提前唤醒（热键切换状态时立即响应，不用轮询）。
+    """
+
+    def __init__(self, min_interval=0.2, max_interval=5.0, backoff=1.5, cpu_budget=0.5, smoothing=0.3):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.cpu_budget = cpu_budget
+        self.smoothing = smoothing
+        self.interval = min_interval
+        self.busy = 0.0
+        self._last_tick = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_rates(cls, min_rate=0.2, max_rate=5.0, **kwargs):
+        # 以每秒帧数配置：max_rate 对应最短间隔，min_rate 对应最长间隔
+        return cls(min_interval=1.0 / max_rate, max_interval=1.0 / min_rate, **kwargs)
+
+    def record(self, changed, busy_seconds=None):
+        with self._lock:
+            if changed:
+                self.interval = self.min_interval
+            else:
+                self.interval = min(self.max_interval, self.interval * self.backoff)
+            if busy_seconds is not None:
+                # 处理耗时做指数平滑，避免单帧抖动
+                self.busy += self.smoothing * (busy_seconds - self.busy)
+
+    def next_interval(self):
+        with self._lock:
+            interval = self.interval
+            if self.cpu_budget and self.cpu_budget < 1.0 and self.busy > 0:
+                # CPU 预算优先于 max_interval：处理本身很慢时宁可更慢也不要占满 CPU
+                interval = max(interval, self.busy * (1.0 - self.cpu_budget) / self.cpu_budget)
+            return interval
+
+    def wait(self, timeout=None):
+        """阻塞到 wake() 或超时（timeout 为 None 时一直等），返回 True 表示被唤醒。"""
+        woken = self._event.wait(timeout)
+        self._event.clear()
+        return woken
+
+    def sleep(self):
+        """距上一次 tick() 不足 next_interval() 时补足剩余时间，可被 wake() 打断。"""
+        if self._last_tick is not None:
+            remaining = self.next_interval() - (time.monotonic() - self._last_tick)
+            if remaining > 0:
+                return self.wait(remaining)
+        return False
+
+    def tick(self):
+        # 每次截图时调用，作为下一次间隔的起点
+        self._last_tick = time.monotonic()
+
+    def wake(self):
+        # 状态变化（解锁、切换模式）后立即截图，并回到最快频率
+        with self._lock:
+            self.interval = self.min_interval
+        self._event.set()
+
+    def reset(self):
+        with self._lock:
+            self.interval = self.min_interval
+            self.busy = 0.0
+            self._last_tick = None
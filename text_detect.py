@@ -0,0 +1,141 @@
+import numpy as np
+
+
+def _edge_cells(gray, cell, edge_threshold):
+    # 水平方向梯度（文字的竖笔画）和竖直方向梯度都要有，纯色块和单向渐变会被排除
+    gray = gray.astype(np.int16)
+    rows, cols = (gray.shape[0] - 1) // cell, (gray.shape[1] - 1) // cell
+    gx = np.abs(np.diff(gray, axis=1))[:rows * cell, :cols * cell] > edge_threshold
+    gy = np.abs(np.diff(gray, axis=0))[:rows * cell, :cols * cell] > edge_threshold
+    area = cell * cell
+    density_x = gx.reshape(rows, cell, cols, cell).sum(axis=(1, 3)) / area
+    density_y = gy.reshape(rows, cell, cols, cell).sum(axis=(1, 3)) / area
+    return density_x, density_y
+
+
+def _label_components(mask):
+    # 4 邻接连通分量，返回每个分量的 (row0, col0, row1, col1)，右下开区间
+    rows, cols = mask.shape
+    seen = np.zeros_like(mask)
+    boxes = []
+    for r0, c0 in zip(*np.nonzero(mask)):
+        if seen[r0, c0]:
+            continue
+        seen[r0, c0] = True
+        stack = [(r0, c0)]
+        top, left, bottom, right = r0, c0, r0, c0
+        while stack:
+            r, c = stack.pop()
+            top, bottom = min(top, r), max(bottom, r)
+            left, right = min(left, c), max(right, c)
+            for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                if 0 <= nr < rows and 0 <= nc < cols and mask[nr, nc] and not seen[nr, nc]:
+                    seen[nr, nc] = True
+                    stack.append((nr, nc))
+        boxes.append((int(top), int(left), int(bottom) + 1, int(right) + 1))
+    return boxes
+
+
+def _overlap_ratio(a, b):
+    # 交集占较小矩形面积的比例
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    smaller = min((a[2] - a[0]) * (a[3] - a[1]), (b[2] - b[0]) * (b[3] - b[1]))
+    return width * height / float(smaller) if smaller > 0 else 0.0
+
+
+def merge_rects(rects, min_overlap=0.5):
+    """
+    反复合并重叠较多（交集不少于较小矩形的 min_overlap）的矩形。
+    只是外扩边缘碰到一起的矩形保持分开，否则密集的屏幕会被并成一个整帧大框。
+    """
+    rects = list(rects)
+    merged = True
+    while merged:
+        merged = False
+        out = []
+        for rect in rects:
+            for i, other in enumerate(out):
+                if _overlap_ratio(rect, other) >= min_overlap:
+                    out[i] = (min(rect[0], other[0]), min(rect[1], other[1]),
+                              max(rect[2], other[2]), max(rect[3], other[3]))
+                    merged = True
+                    break
+            else:
+                out.append(rect)
+        rects = out
+    return rects
+
+
+def detect_text_regions(img, cell=16, downsample=2, edge_threshold=40,
+                        min_density=0.03, max_density=0.5, padding=12, min_overlap=0.5):
+    """
+    基于边缘密度的文字区域检测：缩小后的灰度图按 cell 统计双向梯度密度，
+    密度落在文字区间的 cell 水平膨胀成行，再取连通分量的外接矩形。
+    返回原图坐标的 [(left, top, right, bottom), ...]，已外扩 padding 并合并大面积重叠的框；
+    框之间仍可能有少量重叠，各框识别结果用 assign_region_words 去重。
+    """
+    width, height = img.size
+    gray_img = img.convert("L")
+    if downsample > 1:
+        gray_img = gray_img.reduce(downsample)
+    gray = np.asarray(gray_img)
+    step = cell // downsample if downsample > 1 else cell
+    if gray.shape[0] <= step or gray.shape[1] <= step:
+        return [(0, 0, width, height)]
+
+    density_x, density_y = _edge_cells(gray, step, edge_threshold)
+    mask = (density_x >= min_density) & (density_x <= max_density) & (density_y >= min_density / 2)
+
+    # 水平膨胀一格，把同一行里被字间距分开的 cell 连起来
+    dilated = mask.copy()
+    dilated[:, 1:] |= mask[:, :-1]
+    dilated[:, :-1] |= mask[:, 1:]
+
+    rects = []
+    for row0, col0, row1, col1 in _label_components(dilated):
+        rects.append((
+            max(0, col0 * cell - padding),
+            max(0, row0 * cell - padding),
+            min(width, col1 * cell + padding),
+            min(height, row1 * cell + padding)
+        ))
+    return merge_rects(rects, min_overlap)
+
+
+def assign_region_words(regions, region_words):
+    """
+    每个区域各自 OCR 后合并结果：单词中心落在多个区域时，只保留离边缘最远的那个区域识别出的，
+    那里的单词最不可能被裁切。region_words 与 regions 一一对应，单词为原图坐标。
+    """
+    words = []
+    for i, region_list in enumerate(region_words):
+        for w in region_list:
+            cx = w['left'] + w['width'] / 2.0
+            cy = w['top'] + w['height'] / 2.0
+            owner, best = i, -1.0
+            for j, (left, top, right, bottom) in enumerate(regions):
+                depth = min(cx - left, right - cx, cy - top, bottom - cy)
+                if depth >= 0 and depth > best:
+                    owner, best = j, depth
+            if owner == i:
+                words.append(w)
+    return words
+
+
+def region_coverage(rects, size):
+    """所有矩形的并集面积占整帧的比例（重叠部分只算一次）。"""
+    width, height = size
+    if not rects or not width or not height:
+        return 0.0
+    # 坐标压缩：按所有边界切成小格，统计被任一矩形覆盖的格子面积
+    xs = np.unique([v for r in rects for v in (r[0], r[2])])
+    ys = np.unique([v for r in rects for v in (r[1], r[3])])
+    covered = np.zeros((len(ys) - 1, len(xs) - 1), dtype=bool)
+    for left, top, right, bottom in rects:
+        covered[np.searchsorted(ys, top):np.searchsorted(ys, bottom),
+                np.searchsorted(xs, left):np.searchsorted(xs, right)] = True
+    area = (np.diff(ys)[:, None] * np.diff(xs)[None, :] * covered).sum()
+    return float(area) / (width * height)
@@ -0,0 +1,90 @@
+from functools import lru_cache
+
+from placement import OverlayPlacer
+from render_diff import make_overlay
+
+MIN_FONT_SIZE = 8
+MAX_FONT_SIZE = 40
+# 按等宽近似估算文字尺寸：字符宽 = 字号 * 0.6，行高 = 字号 * 1.5
+CHAR_WIDTH_RATIO = 0.6
+LINE_HEIGHT_RATIO = 1.5
+PADDING = 20
+# 浮窗离屏幕右 / 上边缘至少留的距离
+SCREEN_MARGIN = 10
+
+
+@lru_cache(maxsize=8192)
+def wrap_text(text, max_width, char_width):
+    """按空格贪心折行，返回行的元组；同一 (text, 宽度, 字宽) 只计算一次。"""
+    lines = []
+    current_line = ""
+    for word in text.split():
+        tentative_line = word if not current_line else current_line + " " + word
+        if len(tentative_line) * char_width <= max_width:
+            current_line = tentative_line
+        else:
+            if current_line:
+                lines.append(current_line)
+            current_line = word
+    if current_line:
+        lines.append(current_line)
+    return tuple(lines)
+
+
+def fits(text, width, height, font_size, padding=PADDING):
+    char_width = font_size * CHAR_WIDTH_RATIO
+    lines = wrap_text(text, width - padding, char_width)
+    total_height = len(lines) * font_size * LINE_HEIGHT_RATIO + padding
+    max_line_width = max((len(line) * char_width for line in lines), default=0) + padding
+    return total_height <= height and max_line_width <= width, lines
+
+
+@lru_cache(maxsize=8192)
+def fit_font(text, width, height, min_font=MIN_FONT_SIZE, max_font=MAX_FONT_SIZE, padding=PADDING):
+    """
+    二分查找能放进 width x height 的最大整数字号，返回 (font_size, lines)。
+    字号越大折出的行越多、越宽，fits 对字号单调，二分结果与从大到小逐个尝试一致；
+    都放不下时返回最小字号。
+    """
+    low, high = min_font, max_font
+    best = None
+    while low <= high:
+        mid = (low + high) // 2
+        ok, lines = fits(text, width, height, mid, padding)
+        if ok:
+            best = (mid, lines)
+            low = mid + 1
+        else:
+            high = mid - 1
+    if best is None:
+        best = (min_font, fits(text, width, height, min_font, padding)[1])
+    return best
+
+
+def layout_frame(blocks, translations, screen_width, screen_height, avoid_overlap=True):
+    """
+    把一帧的块和译文排成浮窗（屏幕坐标、左下角为原点），可以在后台线程调用，
+    主线程只需要把结果交给 RenderDiffer。avoid_overlap 时重叠的浮窗依次下移。
+    """
+    placer = OverlayPlacer(screen_width, screen_height, margin=SCREEN_MARGIN) if avoid_overlap else None
+    overlays = []
+    for i, (block, translation) in enumerate(zip(blocks, translations)):
+        x = int(block['left'])
+        top = int(block['top'])
+        w = int(block['width'])
+        h = int(block['height'])
+        text = translation.strip().replace("\n\n", "\n")
+        font_size, _ = fit_font(text, w, h)
+        if placer is not None:
+            x, top = placer.place(x, top, w, h)
+        # macOS 坐标系 y 轴向上
+        y = screen_height - top - h
+        # 限制最终位置不超屏幕边界
+        x = min(x, screen_width - w - SCREEN_MARGIN)
+        y = min(y, screen_height - h - SCREEN_MARGIN)
+        overlays.append(make_overlay(block.get('id', ('index', i)), x, y, w, h, text, font_size))
+    return overlays
+
+
+def cache_info():
+    return {'wrap': wrap_text.cache_info(), 'fit': fit_font.cache_info()}
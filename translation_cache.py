@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class TranslationCache:
+    """
+    翻译缓存：内存 LRU（容量 + TTL 淘汰），可选 sqlite 磁盘持久化。
+    键为 (原文, 源语言, 目标语言, 引擎)。
+    """
+
+    def __init__(self, max_size=5000, ttl=24 * 3600, db_path=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.db_path = db_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        if db_path:
+            self._open_db(db_path)
+
+    def _open_db(self, db_path):
+        folder = os.path.dirname(db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        # 后台翻译线程和主线程都可能访问，统一由 self._lock 串行化
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " text TEXT NOT NULL, source TEXT NOT NULL, target TEXT NOT NULL,"
+            " engine TEXT NOT NULL, translation TEXT NOT NULL, created REAL NOT NULL,"
+            " PRIMARY KEY (text, source, target, engine))"
+        )
+        self._db.commit()
+
+    def get(self, text, source, target, engine):
+        key = (text, source, target, engine)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                translation, created = entry
+                if self.ttl is None or now - created <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return translation
+                del self._entries[key]
+                self.evictions += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT translation, created FROM translations"
+                    " WHERE text=? AND source=? AND target=? AND engine=?",
+                    key
+                ).fetchone()
+                if row is not None and (self.ttl is None or now - row[1] <= self.ttl):
+                    self._insert(key, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, text, source, target, engine, translation):
+        key = (text, source, target, engine)
+        now = time.time()
+        with self._lock:
+            self._insert(key, translation, now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                    key + (translation, now)
+                )
+                self._db.commit()
+
+    def put_many(self, items, source, target, engine):
+        # items: [(原文, 译文), ...]，一次事务写盘
+        now = time.time()
+        with self._lock:
+            for text, translation in items:
+                self._insert((text, source, target, engine), translation, now)
+            if self._db is not None and items:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                    [(text, source, target, engine, translation, now) for text, translation in items]
+                )
+                self._db.commit()
+
+    def _insert(self, key, translation, created):
+        self._entries[key] = (translation, created)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM translations")
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'disk_hits': self.disk_hits,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
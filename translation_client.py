@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+FAILED_TEXT = "[翻译失败]"
+TIMEOUT_TEXT = "[翻译超时]"
+
+
+def split_into_chunks(texts, max_texts, max_chars):
+    """按条数和字符数上限把 texts 切块，返回每块的下标列表。"""
+    chunks = []
+    current = []
+    current_chars = 0
+    for i, text in enumerate(texts):
+        # 单条超过字符上限时独占一块
+        if current and (len(current) >= max_texts or current_chars + len(text) > max_chars):
+            chunks.append(current)
+            current = []
+            current_chars = 0
+        current.append(i)
+        current_chars += len(text)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class TranslationClient:
+    """
+    LibreTranslate HTTP 客户端：复用 keep-alive 连接池，分块并发请求，
+    单请求超时 + 整批截止时间，超时的部分返回占位结果而不是阻塞整个循环。
+    """
+
+    def __init__(self, url, source="auto", target="zh", max_in_flight=4,
+                 request_timeout=5.0, batch_deadline=8.0,
+                 chunk_max_texts=32, chunk_max_chars=2000):
+        self.url = url
+        self.source = source
+        self.target = target
+        self.max_in_flight = max_in_flight
+        self.request_timeout = request_timeout
+        self.batch_deadline = batch_deadline
+        self.chunk_max_texts = chunk_max_texts
+        self.chunk_max_chars = chunk_max_chars
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="translate")
+        self._lock = threading.Lock()
+        self.timeouts = 0
+        self.errors = 0
+
+    def _payload(self, q):
+        return {
+            "q": q,
+            "source": self.source,
+            "target": self.target,
+            "format": "text"
+        }
+
+    def _post(self, q, deadline):
+        # 单请求超时不超过整批剩余时间
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("批次已超时")
+        timeout = min(self.request_timeout, remaining)
+        # 数组形式的 q 只能走 JSON 请求体，表单会丢掉重复字段
+        response = self.session.post(self.url, json=self._payload(q), timeout=timeout)
+        response.raise_for_status()
+        return response.json().get("translatedText")
+
+    def _translate_one(self, text, deadline):
+        try:
+            result = self._post(text, deadline)
+            return (result or "", True)
+        except Exception as e:
+            print("翻译失败：", e)
+            with self._lock:
+                self.errors += 1
+            return (FAILED_TEXT, False)
+
+    def _translate_chunk(self, texts, deadline):
+        try:
+            translated = self._post(texts, deadline)
+            if not isinstance(translated, list) or len(translated) != len(texts):
+                raise ValueError("批量翻译返回数量不匹配")
+            return [(result, True) for result in translated]
+        except Exception as e:
+            # 整块失败时才退回逐条请求
+            print("批量翻译失败，逐条重试：", e)
+            return [self._translate_one(text, deadline) for text in texts]
+
+    def translate(self, texts):
+        """返回 [(译文, 是否成功), ...]，顺序与 texts 一致；截止时间内没完成的块标记为超时。"""
+        if not texts:
+            return []
+        deadline = time.monotonic() + self.batch_deadline
+        chunks = split_into_chunks(texts, self.chunk_max_texts, self.chunk_max_chars)
+        futures = {
+            self._executor.submit(self._translate_chunk, [texts[i] for i in chunk], deadline): chunk
+            for chunk in chunks
+        }
+        done, not_done = wait(futures, timeout=self.batch_deadline)
+
+        results = [(TIMEOUT_TEXT, False)] * len(texts)
+        for future in done:
+            for i, result in zip(futures[future], future.result()):
+                results[i] = result
+        for future in not_done:
+            # 还没开始的直接取消；已在途的请求由自身 timeout 收尾
+            future.cancel()
+        if not_done:
+            with self._lock:
+                self.timeouts += len(not_done)
+            print(f"翻译超时：{len(not_done)}/{len(chunks)} 块未在 {self.batch_deadline}s 内完成")
+        return results
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
@@ -0,0 +1,115 @@
+import os
+import threading
+
+from translation_client import TranslationClient, FAILED_TEXT
+
+
+class TranslationEngine:
+    """
+    翻译引擎接口：translate(texts) 返回 [(译文, 是否成功), ...]，顺序与 texts 一致。
+    name 参与缓存键，不同引擎的译文互不混用。
+    """
+    name = "base"
+
+    def warm_up(self):
+        pass
+
+    def translate(self, texts):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class HttpTranslationEngine(TranslationEngine):
+    """走 LibreTranslate HTTP 服务（默认）。"""
+    name = "libretranslate-http"
+
+    def __init__(self, url, source="auto", target="zh", **client_options):
+        self.client = TranslationClient(url, source=source, target=target, **client_options)
+
+    def translate(self, texts):
+        return self.client.translate(texts)
+
+    def close(self):
+        self.client.close()
+
+
+class ArgosTranslationEngine(TranslationEngine):
+    """
+    进程内 Argos 翻译：模型只加载一次，整批文本一次交给 CTranslate2，
+    不经过 JSON / HTTP，也不需要单独的 LibreTranslate 进程。
+    """
+    name = "argos-inprocess"
+
+    def __init__(self, source="en", target="zh", device="cpu", max_batch_size=32):
+        # Argos 没有自动识别语言，auto 时按 OCR 语言（英文）处理
+        self.source = "en" if source == "auto" else source
+        self.target = target
+        self.device = device
+        self.max_batch_size = max_batch_size
+        self._translator = None
+        self._tokenizer = None
+        self._fallback = None
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        with self._lock:
+            if self._translator is None and self._fallback is None:
+                self._load()
+        # 跑一次小翻译，让模型权重真正进内存
+        self.translate(["Hello"])
+
+    def _load(self):
+        import argostranslate.package
+        import argostranslate.translate
+
+        package = None
+        for pkg in argostranslate.package.get_installed_packages():
+            if pkg.from_code == self.source and pkg.to_code == self.target:
+                package = pkg
+                break
+        if package is None:
+            raise RuntimeError(f"未安装 Argos 语言包：{self.source} -> {self.target}")
+
+        model_dir = os.path.join(str(package.package_path), "model")
+        sp_model = os.path.join(str(package.package_path), "sentencepiece.model")
+        if os.path.isdir(model_dir) and os.path.isfile(sp_model):
+            import ctranslate2
+            import sentencepiece
+
+            self._translator = ctranslate2.Translator(model_dir, device=self.device)
+            self._tokenizer = sentencepiece.SentencePieceProcessor(model_file=sp_model)
+        else:
+            # 旧版语言包格式：退回 Argos 自带的逐条翻译接口
+            self._fallback = argostranslate.translate.get_translation_from_codes(self.source, self.target)
+
+    def translate(self, texts):
+        if not texts:
+            return []
+        try:
+            with self._lock:
+                if self._translator is None and self._fallback is None:
+                    self._load()
+                if self._translator is not None:
+                    tokens = self._tokenizer.encode(list(texts), out_type=str)
+                    outputs = self._translator.translate_batch(
+                        tokens,
+                        max_batch_size=self.max_batch_size,
+                        beam_size=2
+                    )
+                    decoded = [self._tokenizer.decode(out.hypotheses[0]) for out in outputs]
+                else:
+                    decoded = [self._fallback.translate(text) for text in texts]
+            return [(text, True) for text in decoded]
+        except Exception as e:
+            print("翻译失败：", e)
+            return [(FAILED_TEXT, False)] * len(texts)
+
+
+def create_translation_engine(kind, url=None, source="auto", target="zh", **client_options):
+    if kind == "http":
+        return HttpTranslationEngine(url, source=source, target=target, **client_options)
+    if kind == "argos":
+        return ArgosTranslationEngine(source=source, target=target)
+    raise ValueError(f"未知翻译引擎：{kind}")
@@ -0,0 +1,171 @@
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# 会原样出现在译文里的片段：URL、邮箱、@用户名、带数字 / 下划线或驼峰的标识符、数字（含时间、日期、千分位）；
+# 正负号前面不能紧挨单词字符或连字符，避免把 “COVID-19” 的连字符当成负号
+VALUE_PATTERN = re.compile(
+    r"https?://\S+|www\.\S+"
+    r"|[\w.+-]+@[\w-]+\.[\w.-]+"
+    r"|@\w+"
+    r"|\b(?=\w*[A-Za-z])(?=\w*[\d_])\w+\b"
+    r"|\b[a-z]+[A-Z]\w*\b"
+    r"|(?:(?<![\w-])[-+])?\d+(?:[:.,/-]\d+)*"
+)
+
+PLACEHOLDER = "⟦{}⟧"
+_PLACEHOLDER_PATTERN = re.compile("⟦(\\d+)⟧")
+
+
+def normalize(text):
+    """把可变片段替换成 ⟦0⟧、⟦1⟧…，返回 (模板, [原值, ...])。"""
+    values = []
+
+    def replace(match):
+        values.append(match.group(0))
+        return PLACEHOLDER.format(len(values) - 1)
+
+    return VALUE_PATTERN.sub(replace, text), values
+
+
+def make_translation_template(translation, values):
+    """
+    在译文里找回原文的每个值，替换成对应占位符；每个值必须恰好出现一次且互不相同，
+    否则无法确定替换位置，返回 None（这条不进翻译记忆）。
+    """
+    if len(set(values)) != len(values) or "⟦" in translation:
+        return None
+    index = {value: i for i, value in enumerate(values)}
+    found = [0] * len(values)
+
+    def replace(match):
+        i = index.get(match.group(0))
+        if i is None:
+            return match.group(0)
+        found[i] += 1
+        return PLACEHOLDER.format(i)
+
+    template = VALUE_PATTERN.sub(replace, translation)
+    if any(count != 1 for count in found):
+        return None
+    return template
+
+
+def fill_template(template, values):
+    try:
+        return _PLACEHOLDER_PATTERN.sub(lambda m: values[int(m.group(1))], template)
+    except IndexError:
+        return None
+
+
+class TranslationMemory:
+    """
+    翻译记忆：按去掉数字 / URL / 标识符后的模板查找，命中后把本次的值代回模板译文。
+    例如记住了 “3 new messages” → “3 条新消息”，之后 “12 new messages” 直接得到 “12 条新消息”。
+    内存 LRU（dict，O(1) 查找）+ 可选 sqlite（模板主键索引），几十万条仍是一次索引查找。
+    """
+
+    def __init__(self, max_size=200000, db_path=None):
+        self.max_size = max_size
+        self.db_path = db_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.rejected = 0
+        if db_path:
+            self._open_db(db_path)
+
+    def _open_db(self, db_path):
+        folder = os.path.dirname(db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS memory ("
+            " template TEXT NOT NULL, source TEXT NOT NULL, target TEXT NOT NULL,"
+            " engine TEXT NOT NULL, translation TEXT NOT NULL,"
+            " PRIMARY KEY (template, source, target, engine))"
+        )
+        self._db.commit()
+
+    def lookup(self, text, source, target, engine):
+        template, values = normalize(text)
+        # 没有可变片段时精确缓存已经覆盖
+        if not values or "⟦" in text:
+            return None
+        key = (template, source, target, engine)
+        with self._lock:
+            translation = self._entries.get(key)
+            if translation is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute(
+                    "SELECT translation FROM memory WHERE template=? AND source=? AND target=? AND engine=?",
+                    key
+                ).fetchone()
+                if row is not None:
+                    translation = row[0]
+                    self._insert(key, translation)
+            if translation is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return fill_template(translation, values)
+
+    def learn_many(self, items, source, target, engine):
+        # items: [(原文, 译文), ...]；值在译文里找不回来的条目跳过
+        rows = []
+        for text, translation in items:
+            template, values = normalize(text)
+            if not values or "⟦" in text:
+                continue
+            translation_template = make_translation_template(translation, values)
+            if translation_template is None:
+                self.rejected += 1
+                continue
+            rows.append((template, source, target, engine, translation_template))
+        if not rows:
+            return
+        with self._lock:
+            for row in rows:
+                self._insert(row[:4], row[4])
+            self.stored += len(rows)
+            if self._db is not None:
+                self._db.executemany("INSERT OR REPLACE INTO memory VALUES (?, ?, ?, ?, ?)", rows)
+                self._db.commit()
+
+    def _insert(self, key, translation):
+        self._entries[key] = translation
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM memory")
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'stored': self.stored,
+                'rejected': self.rejected,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None